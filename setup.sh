@@ -11,10 +11,10 @@ echo ""
 # Check Python version
 echo "Checking Python version..."
 PYTHON_VERSION=$(python3 --version 2>&1 | awk '{print $2}')
-REQUIRED_VERSION="3.9"
+REQUIRED_VERSION="3.10"
 
-if ! python3 -c "import sys; exit(0 if sys.version_info >= (3,9) else 1)"; then
-    echo "Error: Python 3.9 or higher is required"
+if ! python3 -c "import sys; exit(0 if sys.version_info >= (3,10) else 1)"; then
+    echo "Error: Python 3.10 or higher is required"
     echo "Current version: $PYTHON_VERSION"
     exit 1
 fi
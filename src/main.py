@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Optional
 import click
 from datetime import datetime, timedelta
+import re
 import shutil
 
 from src.config import Config
@@ -22,7 +23,7 @@ from src.database import MusicDatabase
 from src.album_metadata import AlbumMetadata
 from src.deduplication import DeduplicationManager
 from src.working_directory import WorkingDirectoryManager
-from src.sacd_metadata_parser import parse_sacd_metadata_file, find_sacd_metadata_files, write_sacd_metadata_to_flac
+from src.sacd_metadata_parser import parse_sacd_metadata_file, find_sacd_metadata_files, get_sacd_album_info, write_sacd_metadata_to_flac
 import uuid
 
 try:
@@ -31,6 +32,144 @@ except ImportError:
     MutagenFLAC = None
 
 
+def extract_track_metadata(
+    converter,
+    logger,
+    source_file_path: Path,
+    output_file_path: Path,
+    is_from_iso: bool = False,
+    sacd_metadata: Optional[dict] = None,
+    track_number: Optional[int] = None
+) -> dict:
+    """
+    Extract metadata from audio file for database storage.
+    
+    For FLAC sources: Extracts metadata from source file (before conversion)
+    For ISO sources: Extracts metadata from converted file (after conversion)
+    Priority: SACD metadata > embedded tags > filename parsing
+    
+    Args:
+        converter: AudioConverter used to probe the output file's duration
+        logger: Logger for non-fatal tag read errors
+        source_file_path: Path to source audio file
+        output_file_path: Path to converted output file
+        is_from_iso: Whether the track came from an ISO file
+        sacd_metadata: Optional parsed SACD metadata dictionary
+        track_number: Optional track number for matching SACD metadata
+    
+    Returns:
+        Dictionary with extracted metadata fields
+    """
+    metadata = {
+        'title': None,
+        'track_number': None,
+        'duration_seconds': None,
+        'artist': None,
+        'album': None,
+        'date': None,
+        'genre': None,
+        'musicians': None
+    }
+    
+    # Priority 1: Use SACD metadata if available
+    if sacd_metadata and track_number is not None:
+        # Find the matching track in SACD metadata
+        sacd_track = None
+        if 'tracks' in sacd_metadata:
+            for track in sacd_metadata['tracks']:
+                if track.get('track_number') == track_number:
+                    sacd_track = track
+                    break
+        
+        # Apply SACD track metadata
+        if sacd_track:
+            if 'title' in sacd_track:
+                metadata['title'] = sacd_track['title']
+            if 'artist' in sacd_track:
+                metadata['artist'] = sacd_track['artist']
+            if 'duration_seconds' in sacd_track:
+                metadata['duration_seconds'] = sacd_track['duration_seconds']
+            metadata['track_number'] = track_number
+        
+        # Apply SACD album/disc metadata
+        sacd_info = get_sacd_album_info(sacd_metadata)
+        if sacd_info:
+            if not metadata['artist'] and 'artist' in sacd_info:
+                metadata['artist'] = sacd_info['artist']
+            if 'album' in sacd_info or 'title' in sacd_info:
+                metadata['album'] = sacd_info.get('album') or sacd_info.get('title')
+            if 'genre' in sacd_info:
+                metadata['genre'] = sacd_info['genre']
+    
+    # Priority 2: Determine which file to extract metadata from
+    # For FLAC sources, use source file (preserves original metadata)
+    # For ISO sources, use output file (ISO may not have embedded metadata)
+    metadata_file = output_file_path if is_from_iso else source_file_path
+    
+    # Extract metadata from FLAC file using mutagen (only fill in missing values)
+    if MutagenFLAC and metadata_file.exists() and metadata_file.suffix.lower() == '.flac':
+        try:
+            audio = MutagenFLAC(str(metadata_file))
+            
+            # Extract basic tags (only if not already set by SACD metadata)
+            if not metadata['title'] and 'title' in audio:
+                metadata['title'] = audio['title'][0]
+            if not metadata['track_number'] and 'tracknumber' in audio:
+                # Handle formats like "1" or "1/12"
+                track_str = audio['tracknumber'][0]
+                metadata['track_number'] = int(track_str.split('/')[0])
+            if not metadata['artist'] and 'artist' in audio:
+                metadata['artist'] = audio['artist'][0]
+            if not metadata['album'] and 'album' in audio:
+                metadata['album'] = audio['album'][0]
+            if not metadata['date'] and 'date' in audio:
+                metadata['date'] = audio['date'][0]
+            if not metadata['genre'] and 'genre' in audio:
+                metadata['genre'] = audio['genre'][0]
+            
+            # Extract musicians information if available (only if not already set)
+            if not metadata['musicians']:
+                musicians_list = []
+                for tag in ['performer', 'composer', 'conductor', 'orchestra']:
+                    if tag in audio:
+                        for value in audio[tag]:
+                            musicians_list.append({
+                                'role': tag,
+                                'name': value
+                            })
+                
+                if musicians_list:
+                    metadata['musicians'] = musicians_list
+        
+        except Exception as e:
+            logger.debug(f"Could not extract mutagen metadata from {metadata_file}: {e}")
+    
+    # Priority 3: Fallback - Parse track number and title from filename if not found
+    if metadata['track_number'] is None:
+        match = re.match(r'^(\d+)', metadata_file.stem)
+        if match:
+            metadata['track_number'] = int(match.group(1))
+    
+    if metadata['title'] is None:
+        # Use filename as title, cleaning up common patterns
+        title = metadata_file.stem
+        # Remove leading track numbers (e.g., "01 - Title" -> "Title")
+        title = re.sub(r'^\d+\s*[-.]?\s*', '', title)
+        metadata['title'] = title if title else metadata_file.stem
+    
+    # Get duration from ffprobe if not already set
+    if not metadata['duration_seconds'] and output_file_path.exists():
+        file_info = converter.get_file_info(output_file_path)
+        if file_info and 'format' in file_info:
+            try:
+                duration = float(file_info['format'].get('duration', 0))
+                metadata['duration_seconds'] = round(duration, 2) if duration > 0 else None
+            except (ValueError, TypeError):
+                pass
+    
+    return metadata
+
+
 class ConversionOrchestrator:
     """
     Orchestrates the entire conversion process.
@@ -646,7 +785,6 @@ class ConversionOrchestrator:
                     output_file_path = output_file_path.with_suffix('.dsf')
                 
                 # Extract track number from filename if possible
-                import re
                 track_num = None
                 match = re.match(r'^(\d+)', music_file.path.stem)
                 if match:
@@ -751,7 +889,7 @@ class ConversionOrchestrator:
                                                 self.logger.info(f"  Found SACD metadata file with {len(sacd_metadata.get('tracks', []))} tracks")
                                                 
                                                 # Update album with SACD metadata
-                                                sacd_info = sacd_metadata.get('album', {}) or sacd_metadata.get('disc', {})
+                                                sacd_info = get_sacd_album_info(sacd_metadata)
                                                 if sacd_info:
                                                     album_updates = {}
                                                     if 'catalog_number' in sacd_info:
@@ -780,7 +918,6 @@ class ConversionOrchestrator:
                                             
                                             for track_file in output_files:
                                                 # Parse track number from filename
-                                                import re
                                                 track_num_match = re.match(r'^(\d+)', track_file.stem)
                                                 track_num = int(track_num_match.group(1)) if track_num_match else None
                                                 
@@ -1325,7 +1462,7 @@ class ConversionOrchestrator:
         if sacd_metadata_files:
             sacd_metadata = parse_sacd_metadata_file(sacd_metadata_files[0])
             if sacd_metadata:
-                sacd_info = sacd_metadata.get('album', {}) or sacd_metadata.get('disc', {})
+                sacd_info = get_sacd_album_info(sacd_metadata)
                 if sacd_info:
                     if 'artist' in sacd_info:
                         metadata['artist'] = sacd_info['artist']
@@ -1371,129 +1508,18 @@ class ConversionOrchestrator:
         """
         Extract metadata from audio file for database storage.
         
-        For FLAC sources: Extracts metadata from source file (before conversion)
-        For ISO sources: Extracts metadata from converted file (after conversion)
-        Priority: SACD metadata > embedded tags > filename parsing
-        
-        Args:
-            source_file_path: Path to source audio file
-            output_file_path: Path to converted output file
-            is_from_iso: Whether the track came from an ISO file
-            sacd_metadata: Optional parsed SACD metadata dictionary
-            track_number: Optional track number for matching SACD metadata
-            
-        Returns:
-            Dictionary with extracted metadata fields
+        Delegates to extract_track_metadata() with this orchestrator's
+        converter and logger.
         """
-        metadata = {
-            'title': None,
-            'track_number': None,
-            'duration_seconds': None,
-            'artist': None,
-            'album': None,
-            'date': None,
-            'genre': None,
-            'musicians': None
-        }
-        
-        # Priority 1: Use SACD metadata if available
-        if sacd_metadata and track_number is not None:
-            # Find the matching track in SACD metadata
-            sacd_track = None
-            if 'tracks' in sacd_metadata:
-                for track in sacd_metadata['tracks']:
-                    if track.get('track_number') == track_number:
-                        sacd_track = track
-                        break
-            
-            # Apply SACD track metadata
-            if sacd_track:
-                if 'title' in sacd_track:
-                    metadata['title'] = sacd_track['title']
-                if 'artist' in sacd_track:
-                    metadata['artist'] = sacd_track['artist']
-                if 'duration_seconds' in sacd_track:
-                    metadata['duration_seconds'] = sacd_track['duration_seconds']
-                metadata['track_number'] = track_number
-            
-            # Apply SACD album/disc metadata
-            sacd_info = sacd_metadata.get('album', {}) or sacd_metadata.get('disc', {})
-            if sacd_info:
-                if not metadata['artist'] and 'artist' in sacd_info:
-                    metadata['artist'] = sacd_info['artist']
-                if 'album' in sacd_info or 'title' in sacd_info:
-                    metadata['album'] = sacd_info.get('album') or sacd_info.get('title')
-                if 'genre' in sacd_info:
-                    metadata['genre'] = sacd_info['genre']
-        
-        # Priority 2: Determine which file to extract metadata from
-        # For FLAC sources, use source file (preserves original metadata)
-        # For ISO sources, use output file (ISO may not have embedded metadata)
-        metadata_file = output_file_path if is_from_iso else source_file_path
-        
-        # Extract metadata from FLAC file using mutagen (only fill in missing values)
-        if MutagenFLAC and metadata_file.exists() and metadata_file.suffix.lower() == '.flac':
-            try:
-                audio = MutagenFLAC(str(metadata_file))
-                
-                # Extract basic tags (only if not already set by SACD metadata)
-                if not metadata['title'] and 'title' in audio:
-                    metadata['title'] = audio['title'][0]
-                if not metadata['track_number'] and 'tracknumber' in audio:
-                    # Handle formats like "1" or "1/12"
-                    track_str = audio['tracknumber'][0]
-                    metadata['track_number'] = int(track_str.split('/')[0])
-                if not metadata['artist'] and 'artist' in audio:
-                    metadata['artist'] = audio['artist'][0]
-                if not metadata['album'] and 'album' in audio:
-                    metadata['album'] = audio['album'][0]
-                if not metadata['date'] and 'date' in audio:
-                    metadata['date'] = audio['date'][0]
-                if not metadata['genre'] and 'genre' in audio:
-                    metadata['genre'] = audio['genre'][0]
-                
-                # Extract musicians information if available (only if not already set)
-                if not metadata['musicians']:
-                    musicians_list = []
-                    for tag in ['performer', 'composer', 'conductor', 'orchestra']:
-                        if tag in audio:
-                            for value in audio[tag]:
-                                musicians_list.append({
-                                    'role': tag,
-                                    'name': value
-                                })
-                    
-                    if musicians_list:
-                        metadata['musicians'] = musicians_list
-                    
-            except Exception as e:
-                self.logger.debug(f"Could not extract mutagen metadata from {metadata_file}: {e}")
-        
-        # Priority 3: Fallback - Parse track number and title from filename if not found
-        if metadata['track_number'] is None:
-            import re
-            match = re.match(r'^(\d+)', metadata_file.stem)
-            if match:
-                metadata['track_number'] = int(match.group(1))
-        
-        if metadata['title'] is None:
-            # Use filename as title, cleaning up common patterns
-            title = metadata_file.stem
-            # Remove leading track numbers (e.g., "01 - Title" -> "Title")
-            title = re.sub(r'^\d+\s*[-.]?\s*', '', title)
-            metadata['title'] = title if title else metadata_file.stem
-        
-        # Get duration from ffprobe if not already set
-        if not metadata['duration_seconds'] and output_file_path.exists():
-            file_info = self.converter.get_file_info(output_file_path)
-            if file_info and 'format' in file_info:
-                try:
-                    duration = float(file_info['format'].get('duration', 0))
-                    metadata['duration_seconds'] = round(duration, 2) if duration > 0 else None
-                except (ValueError, TypeError):
-                    pass
-        
-        return metadata
+        return extract_track_metadata(
+            self.converter,
+            self.logger,
+            source_file_path,
+            output_file_path,
+            is_from_iso=is_from_iso,
+            sacd_metadata=sacd_metadata,
+            track_number=track_number
+        )
 
 @click.command()
 @click.argument('input_dir', type=click.Path(exists=True, file_okay=False, path_type=Path), required=False)
@@ -3,9 +3,17 @@ SACD Metadata Parser
 Parses metadata text files generated by sacd_extract to extract disc, album, and track information.
 """
 
+import copy
+import functools
+import io
+import os
 import re
+import stat
+import sys
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, IO, Mapping, Tuple, Union
 
 try:
     from mutagen.flac import FLAC
@@ -13,75 +21,133 @@ except ImportError:
     FLAC = None
 
 
-def parse_sacd_metadata_file(file_path: Path) -> Optional[Dict[str, Any]]:
+# Don't process metadata files larger than this
+MAX_METADATA_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Markers identifying sacd_extract metadata text (checked on raw bytes)
+_METADATA_MARKERS = (b'Disc Information:', b'Album Information:', b'Track list')
+
+# Marker sniffing reads in chunks of this size, up to the limit; the limit
+# covers files with long headers/preambles before the first marker
+_SNIFF_CHUNK_SIZE = 4096
+_SNIFF_LIMIT = 50000
+
+# Upper bound on concurrent marker sniffs per directory
+_SNIFF_WORKERS = 8
+
+# File names that usually hold sacd_extract metadata
+_METADATA_NAME_RE = re.compile(r'sacd|metadata|info', re.IGNORECASE)
+
+# Disc section field names → metadata keys
+_DISC_FIELD_MAP = {
+    'Disc Catalog Number': 'catalog_number',
+    'Disc Genre': 'genre',
+    'Title': 'title',
+    'Artist': 'artist',
+    'Publisher': 'label',
+    'Copyright': 'copyright',
+}
+
+# Album section field names → metadata keys
+_ALBUM_FIELD_MAP = {
+    'Album Catalog Number': 'catalog_number',
+    'Album Genre': 'genre',
+    'Title': 'title',
+    'Artist': 'artist',
+    'Publisher': 'label',
+    'Copyright': 'copyright',
+}
+
+# Section headers whose bodies hold "Field: value" lines
+_SECTION_HEADERS = {
+    'Disc Information': 'disc',
+    'Album Information': 'album',
+}
+
+# Any other unindented "Header:" line ends the current section
+_SECTION_BOUNDARY_RE = re.compile(r'[A-Z][a-z]+.*?:')
+
+# Vorbis comment tag → disc/album info field (Publisher → LABEL, etc.)
+_ALBUM_TAG_FIELDS = (
+    ('label', 'label'),
+    ('catalognumber', 'catalog_number'),
+    ('genre', 'genre'),
+    ('artist', 'artist'),
+    ('albumartist', 'artist'),
+    ('album', 'title'),
+)
+
+# Every tag write_sacd_metadata_to_flac may add to a FLAC file
+_SACD_TAG_KEYS = frozenset(tag for tag, _ in _ALBUM_TAG_FIELDS) | {'title', 'tracknumber'}
+
+# An SACD area holds at most 255 tracks; larger indices mean corrupt input
+_MAX_TRACKS = 255
+
+# Track list fields, matched in one alternation; match.lastgroup names the field.
+# Fields always start a line, so anchoring lets the scanner reject every
+# other position after one character instead of trying each alternative.
+_TRACK_FIELD_RE = re.compile(
+    r'^[ \t]*(?:'
+    r'(?P<title>Title\[(?P<title_index>\d+)\]:\s*(?P<title_value>.+))'
+    r'|(?P<performer>(?i:Performer)\[(?P<performer_index>\d+)\]:\s*(?P<performer_value>.+))'
+    r'|(?P<duration>Duration:\s*(?P<minutes>\d+):(?P<seconds>\d+):\d+)'
+    r')',
+    re.MULTILINE
+)
+
+
+def parse_sacd_metadata_file(source: Union[Path, IO[str], bytes]) -> Optional[Dict[str, Any]]:
     """
     Parse SACD metadata from a text file.
     
     Args:
-        file_path: Path to the SACD metadata text file
+        source: Path to the SACD metadata text file, an open text stream,
+            or the file's raw bytes
         
     Returns:
         Dictionary with parsed metadata or None if parsing fails
     """
-    if not file_path:
+    if not source:
         return None
-        
-    if not file_path.exists():
+    
+    # Raw file contents are decoded the same way files are read
+    if isinstance(source, (bytes, bytearray)):
+        source = io.StringIO(source.decode('utf-8', errors='ignore'))
+    
+    # Already-open streams (e.g. io.StringIO) are parsed directly
+    if hasattr(source, 'read'):
+        try:
+            return _parse_metadata_stream(source)
+        except Exception as e:
+            print(f"Error: Unexpected error parsing SACD metadata stream: {e}")
+            return None
+    
+    file_path = source
+    
+    # A single stat answers exists/is-file/size; the size limit is checked
+    # before the file is ever opened
+    try:
+        file_stat = file_path.stat()
+    except OSError:
         return None
     
-    if not file_path.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         return None
     
     try:
         # Check file size - don't process extremely large files
-        file_size = file_path.stat().st_size
-        if file_size > 10 * 1024 * 1024:  # 10MB limit
+        file_size = file_stat.st_size
+        if file_size > MAX_METADATA_FILE_SIZE:
             print(f"Warning: SACD metadata file {file_path} is too large ({file_size} bytes), skipping")
             return None
         
         if file_size == 0:
             return None
         
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        if not content.strip():
-            return None
-        
-        metadata = {
-            'disc': {},
-            'album': {},
-            'tracks': []
-        }
-        
-        # Parse disc information
-        try:
-            disc_section = _extract_section(content, 'Disc Information:')
-            if disc_section:
-                metadata['disc'] = _parse_disc_info(disc_section)
-        except Exception as e:
-            print(f"Warning: Failed to parse disc information: {e}")
-            metadata['disc'] = {}
-        
-        # Parse album information
-        try:
-            album_section = _extract_section(content, 'Album Information:')
-            if album_section:
-                metadata['album'] = _parse_album_info(album_section)
-        except Exception as e:
-            print(f"Warning: Failed to parse album information: {e}")
-            metadata['album'] = {}
-        
-        # Parse track list
-        try:
-            tracks = _parse_track_list(content)
-            if tracks:
-                metadata['tracks'] = tracks
-        except Exception as e:
-            print(f"Warning: Failed to parse track list: {e}")
-            metadata['tracks'] = []
-        
-        return metadata
+        # The same sidecar file is parsed once per track of an album, so reuse
+        # the result while the file is unchanged. Callers get their own copy.
+        metadata = _parse_metadata_file_cached(str(file_path), file_stat.st_mtime_ns, file_size)
+        return copy.deepcopy(metadata)
         
     except PermissionError as e:
         print(f"Error: Permission denied reading SACD metadata file {file_path}: {e}")
@@ -97,13 +163,135 @@ def parse_sacd_metadata_file(file_path: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _extract_section(content: str, section_header: str) -> Optional[str]:
-    """Extract a section from the content."""
-    pattern = re.escape(section_header) + r'(.*?)(?=\n[A-Z][a-z]+.*?:|$)'
-    match = re.search(pattern, content, re.DOTALL)
-    if match:
-        return match.group(1)
-    return None
+@functools.lru_cache(maxsize=256)
+def _parse_metadata_file_cached(path_str: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+    """
+    Read and parse a metadata file.
+    
+    mtime_ns and size are only part of the cache key, so an edited file is
+    parsed again. Returned dictionaries are shared and must not be mutated.
+    """
+    with open(path_str, 'r', encoding='utf-8', errors='ignore') as f:
+        return _parse_metadata_stream(f)
+
+
+def _parse_metadata_stream(f: IO[str]) -> Optional[Dict[str, Any]]:
+    """Parse disc, album and track information from a metadata text stream."""
+    sections = _read_metadata_sections(f)
+    if sections is None:
+        return None
+    
+    metadata = {
+        'disc': {},
+        'album': {},
+        'tracks': []
+    }
+    
+    # Parse disc information
+    try:
+        disc_section = ''.join(sections['disc'])
+        if disc_section:
+            metadata['disc'] = _parse_disc_info(disc_section)
+    except Exception as e:
+        print(f"Warning: Failed to parse disc information: {e}")
+        metadata['disc'] = {}
+    
+    # Parse album information
+    try:
+        album_section = ''.join(sections['album'])
+        if album_section:
+            metadata['album'] = _parse_album_info(album_section)
+    except Exception as e:
+        print(f"Warning: Failed to parse album information: {e}")
+        metadata['album'] = {}
+    
+    # Parse track list
+    try:
+        tracks = _parse_track_list(''.join(sections['tracks']))
+        if tracks:
+            metadata['tracks'] = tracks
+    except Exception as e:
+        print(f"Warning: Failed to parse track list: {e}")
+        metadata['tracks'] = []
+    
+    return metadata
+
+
+def _read_metadata_sections(f: IO[str]) -> Optional[Dict[str, List[str]]]:
+    """
+    Read metadata text line by line, sorting lines into per-section buffers.
+    
+    Returns line buffers for the 'disc' and 'album' section bodies and for
+    'tracks' (everything outside those two sections), or None if the text
+    is blank. A section runs from its header to the next unindented
+    "Header:" line.
+    
+    sacd_extract dumps can contain further areas (e.g. multichannel) or padding
+    after the first track list; none of it is used, so reading stops after the
+    Duration line of the last expected track. Reading is also capped at
+    MAX_METADATA_FILE_SIZE bytes of UTF-8 text, the same limit the path
+    branch applies to the file size, so corrupt inputs without a usable
+    Track Count can't run unbounded.
+    """
+    sections = {'disc': [], 'album': [], 'tracks': []}
+    current = 'tracks'
+    seen_headers = set()
+    has_content = False
+    bytes_read = 0
+    track_count_expected = None
+    durations_seen = 0
+    
+    for line in f:
+        # Lines are decoded text; count their UTF-8 size so multi-byte
+        # (e.g. Japanese) metadata isn't allowed past the byte limit.
+        # ASCII lines, the common case, skip the encode
+        bytes_read += len(line) if line.isascii() else len(line.encode('utf-8', 'surrogatepass'))
+        if bytes_read > MAX_METADATA_FILE_SIZE:
+            break
+        
+        stripped = line.strip()
+        if not stripped:
+            sections[current].append(line)
+            continue
+        has_content = True
+        
+        # Split once; the parts are reused for every check below
+        field, sep, rest = stripped.partition(':')
+        
+        # Only the first disc/album header opens a section
+        header = _SECTION_HEADERS.get(field) if sep else None
+        if header is not None and header not in seen_headers:
+            seen_headers.add(header)
+            current = header
+            # Keep anything following the header on the same line
+            sections[current].append(rest + '\n')
+            continue
+        
+        # Start time codes are never used; dropping them here keeps them out
+        # of the track list scan
+        if field == 'Track_Start_Time_Code':
+            continue
+        
+        if _SECTION_BOUNDARY_RE.match(line):
+            current = 'tracks'
+        sections[current].append(line)
+        
+        if not sep:
+            continue
+        if field == 'Track Count' and track_count_expected is None:
+            try:
+                track_count_expected = int(rest)
+            except ValueError:
+                track_count_expected = None
+        elif field == 'Duration' and track_count_expected:
+            durations_seen += 1
+            if len(seen_headers) == len(_SECTION_HEADERS) and durations_seen == track_count_expected:
+                break
+    
+    if not has_content:
+        return None
+    
+    return sections
 
 
 def _parse_disc_info(section: str) -> Dict[str, Any]:
@@ -114,35 +302,7 @@ def _parse_disc_info(section: str) -> Dict[str, Any]:
         return disc_info
     
     try:
-        # Extract catalog number (Disc Catalog Number → catalog_number)
-        catalog = _extract_value(section, r'Disc Catalog Number:\s*(.+)')
-        if catalog:
-            disc_info['catalog_number'] = catalog.strip()
-        
-        # Extract genre (Disc Genre → genre)
-        genre = _extract_value(section, r'Disc Genre:\s*(.+)')
-        if genre:
-            disc_info['genre'] = genre.strip()
-        
-        # Extract title
-        title = _extract_value(section, r'Title:\s*(.+)')
-        if title:
-            disc_info['title'] = title.strip()
-        
-        # Extract artist
-        artist = _extract_value(section, r'Artist:\s*(.+)')
-        if artist:
-            disc_info['artist'] = artist.strip()
-        
-        # Extract publisher (Publisher → label)
-        publisher = _extract_value(section, r'Publisher:\s*(.+)')
-        if publisher:
-            disc_info['label'] = publisher.strip()
-        
-        # Extract copyright
-        copyright_text = _extract_value(section, r'Copyright:\s*(.+)')
-        if copyright_text:
-            disc_info['copyright'] = copyright_text.strip()
+        _parse_fields(section, _DISC_FIELD_MAP, disc_info)
     except Exception as e:
         print(f"Warning: Error parsing disc info field: {e}")
     
@@ -157,41 +317,28 @@ def _parse_album_info(section: str) -> Dict[str, Any]:
         return album_info
     
     try:
-        # Extract album catalog number
-        catalog = _extract_value(section, r'Album Catalog Number:\s*(.+)')
-        if catalog:
-            album_info['catalog_number'] = catalog.strip()
-        
-        # Extract genre
-        genre = _extract_value(section, r'Album Genre:\s*(.+)')
-        if genre:
-            album_info['genre'] = genre.strip()
-        
-        # Extract title
-        title = _extract_value(section, r'Title:\s*(.+)')
-        if title:
-            album_info['title'] = title.strip()
-        
-        # Extract artist
-        artist = _extract_value(section, r'Artist:\s*(.+)')
-        if artist:
-            album_info['artist'] = artist.strip()
-        
-        # Extract publisher (Publisher → label)
-        publisher = _extract_value(section, r'Publisher:\s*(.+)')
-        if publisher:
-            album_info['label'] = publisher.strip()
-        
-        # Extract copyright
-        copyright_text = _extract_value(section, r'Copyright:\s*(.+)')
-        if copyright_text:
-            album_info['copyright'] = copyright_text.strip()
+        _parse_fields(section, _ALBUM_FIELD_MAP, album_info)
     except Exception as e:
         print(f"Warning: Error parsing album info field: {e}")
     
     return album_info
 
 
+def _parse_fields(section: str, field_map: Dict[str, str], info: Dict[str, Any]) -> None:
+    """Fill info from the section's "Field: value" lines using field_map."""
+    for line in section.splitlines():
+        field, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = field_map.get(field.strip())
+        if key is None or key in info:
+            continue
+        value = value.strip()
+        if value:
+            # Disc and album sections usually repeat the same values
+            info[key] = sys.intern(value)
+
+
 def _parse_track_list(content: str) -> List[Dict[str, Any]]:
     """Parse track list from content."""
     tracks = []
@@ -200,67 +347,60 @@ def _parse_track_list(content: str) -> List[Dict[str, Any]]:
         return tracks
     
     try:
-        # Find all Title[N] entries with their positions
-        title_pattern = r'Title\[(\d+)\]:\s*(.+)'
-        title_matches = [(m.group(1), m.group(2), m.start()) for m in re.finditer(title_pattern, content)]
-        
-        for i, (track_index, track_title, start_pos) in enumerate(title_matches):
-            try:
-                track_num = int(track_index)
-                
-                # Get the section for this track (from this Title to next Title or end)
-                if i < len(title_matches) - 1:
-                    end_pos = title_matches[i + 1][2]
-                    track_section = content[start_pos:end_pos]
-                else:
-                    track_section = content[start_pos:]
-                
-                track_info = {
-                    'track_number': track_num + 1,  # Convert 0-based to 1-based
-                    'title': track_title.strip()
-                }
-                
-                # Extract performer for this track within its section
-                try:
-                    performer_pattern = rf'Performer\[{track_index}\]:\s*(.+)'
-                    performer = _extract_value(track_section, performer_pattern)
-                    if performer:
-                        track_info['artist'] = performer.strip()
-                except Exception as e:
-                    print(f"Warning: Failed to parse performer for track {track_num + 1}: {e}")
-                
-                # Extract duration for this track (format: MM:SS:FF [mins:secs:frames])
-                # Search within this track's section only
+        # Single pass over the content; Performer/Duration lines belong to the
+        # most recent Title[N] line. Tracks are stored at their 0-based index,
+        # so the list comes out in track order without sorting.
+        tracks_by_index = []
+        current_track = None
+        
+        for match in _TRACK_FIELD_RE.finditer(content):
+            field = match.lastgroup
+            
+            if field == 'title':
+                track_index = int(match.group('title_index'))
+                if track_index >= _MAX_TRACKS:
+                    print(f"Warning: Ignoring out-of-range track index {track_index}")
+                    current_track = None
+                    continue
+                while len(tracks_by_index) <= track_index:
+                    tracks_by_index.append(None)
+                current_track = tracks_by_index[track_index]
+                if current_track is None:
+                    current_track = {
+                        'track_number': track_index + 1,  # Convert 0-based to 1-based
+                        'title': match.group('title_value').strip()
+                    }
+                    tracks_by_index[track_index] = current_track
+            
+            elif field == 'performer':
+                performer_index = int(match.group('performer_index'))
+                if performer_index >= len(tracks_by_index):
+                    continue
+                track = tracks_by_index[performer_index]
+                performer = match.group('performer_value').strip()
+                if track is not None and performer and 'artist' not in track:
+                    # The same performer is typically listed on every track
+                    track['artist'] = sys.intern(performer)
+            
+            elif field == 'duration' and current_track is not None:
+                # Format: MM:SS:FF [mins:secs:frames]
+                if 'duration_seconds' in current_track:
+                    continue
+                # Frames are ignored for now (SACD uses 75 frames per second)
+                minutes, seconds = match.group('minutes', 'seconds')
                 try:
-                    duration_pattern = r'Duration:\s*(\d+):(\d+):(\d+)'
-                    duration_match = re.search(duration_pattern, track_section)
-                    if duration_match:
-                        minutes = int(duration_match.group(1))
-                        seconds = int(duration_match.group(2))
-                        # Frames are ignored for now (SACD uses 75 frames per second)
-                        total_seconds = minutes * 60 + seconds
-                        track_info['duration_seconds'] = float(total_seconds)
-                except (ValueError, IndexError) as e:
-                    print(f"Warning: Failed to parse duration for track {track_num + 1}: {e}")
-                
-                tracks.append(track_info)
-            except Exception as e:
-                print(f"Warning: Failed to parse track at index {track_index}: {e}")
-                continue
+                    current_track['duration_seconds'] = float(int(minutes) * 60 + int(seconds))
+                except ValueError as e:
+                    print(f"Warning: Failed to parse duration for track {current_track['track_number']}: {e}")
+        
+        # Drop gaps left by missing indices
+        tracks = [track for track in tracks_by_index if track is not None]
     except Exception as e:
         print(f"Warning: Error parsing track list: {e}")
     
     return tracks
 
 
-def _extract_value(text: str, pattern: str) -> Optional[str]:
-    """Extract a value using a regex pattern."""
-    match = re.search(pattern, text, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return None
-
-
 def find_sacd_metadata_files(directory: Path) -> List[Path]:
     """
     Find SACD metadata text files in a directory.
@@ -281,54 +421,102 @@ def find_sacd_metadata_files(directory: Path) -> List[Path]:
         return []
     
     try:
-        # Common patterns for SACD metadata files
-        patterns = [
-            '*.txt',
-            'SACD*.txt',
-            '*info*.txt',
-            '*metadata*.txt'
-        ]
-        
-        found_files = []
-        for pattern in patterns:
-            try:
-                found_files.extend(directory.glob(pattern))
-            except Exception as e:
-                print(f"Warning: Error searching for pattern {pattern} in {directory}: {e}")
+        return _find_metadata_files(str(directory))
+    except Exception as e:
+        print(f"Error finding SACD metadata files in {directory}: {e}")
+        return []
+
+
+def _find_metadata_files(dir_str: str) -> List[Path]:
+    """Scan a directory for SACD metadata files."""
+    # os.scandir yields the file type from the directory listing itself, so
+    # non-files are skipped without a stat call per entry. The listing is
+    # never cached: a directory's mtime misses in-place rewrites and changes
+    # within the filesystem's timestamp granularity
+    candidates = []
+    with os.scandir(dir_str) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.txt'):
                 continue
-        
-        # Remove duplicates and filter by content
-        unique_files = list(set(found_files))
-        
-        # Verify files contain SACD metadata by checking for key markers
-        verified_files = []
-        for file in unique_files:
             try:
-                # Check file is readable
-                if not file.is_file():
+                # Check entry is a regular file
+                if not entry.is_file():
                     continue
-                    
+                
+                file_stat = entry.stat()
                 # Don't read extremely large files
-                if file.stat().st_size > 10 * 1024 * 1024:  # 10MB limit
+                if file_stat.st_size > MAX_METADATA_FILE_SIZE:
                     continue
-                
-                with open(file, 'r', encoding='utf-8', errors='ignore') as f:
-                    # Read first 50KB to handle files with long headers/preambles
-                    # (previous 1000 char limit could miss markers in files with verbose headers)
-                    content = f.read(50000)
-                    # Check for SACD metadata markers
-                    if any(marker in content for marker in ['Disc Information:', 'Album Information:', 'Track list']):
-                        verified_files.append(file)
-            except (PermissionError, IOError):
-                continue
-            except Exception as e:
-                print(f"Warning: Error checking file {file}: {e}")
+            except OSError:
                 continue
-        
-        return verified_files
+            candidates.append((entry.name, entry.path, file_stat.st_mtime_ns, file_stat.st_size))
+    
+    # Names that look like metadata files are checked (and returned) first so
+    # callers using the first match prefer them
+    candidates.sort(key=lambda c: (not _METADATA_NAME_RE.search(c[0]), c[0]))
+    
+    # Verify files contain SACD metadata by checking for key markers. The
+    # reads are independent, so several are kept in flight at once to
+    # overlap their latency (matters on network shares and spinning disks)
+    keys = [(path, mtime_ns, size) for _, path, mtime_ns, size in candidates]
+    if len(keys) > 1:
+        with ThreadPoolExecutor(max_workers=min(_SNIFF_WORKERS, len(keys))) as executor:
+            results = list(executor.map(lambda key: _sniff_header_cached(*key), keys))
+    else:
+        results = [_sniff_header_cached(*key) for key in keys]
+    
+    return [Path(path) for (path, _, _), is_metadata in zip(keys, results) if is_metadata]
+
+
+@functools.lru_cache(maxsize=1024)
+def _sniff_header_cached(path: str, mtime_ns: int, size: int) -> bool:
+    """
+    Check a file for SACD metadata markers.
+    
+    mtime_ns and size are only part of the cache key, so a file rewritten
+    in place is checked again.
+    """
+    return _sniff_header(path)[1]
+
+
+def _sniff_header(path: str) -> Tuple[str, bool]:
+    """Return (path, True) if the file looks like SACD metadata."""
+    try:
+        return path, _has_metadata_markers(path)
+    except (PermissionError, IOError):
+        return path, False
     except Exception as e:
-        print(f"Error finding SACD metadata files in {directory}: {e}")
-        return []
+        print(f"Warning: Error checking file {path}: {e}")
+        return path, False
+
+
+def _has_metadata_markers(file_path: Union[str, Path]) -> bool:
+    """
+    Check the head of a file for SACD metadata markers.
+    
+    Reads raw bytes in small chunks and stops at the first marker, so a
+    typical metadata file costs a single 4KB read. Files with long
+    preambles are still searched up to _SNIFF_LIMIT bytes.
+    """
+    overlap = max(len(marker) for marker in _METADATA_MARKERS) - 1
+    tail = b''
+    bytes_read = 0
+    
+    with open(file_path, 'rb') as f:
+        while bytes_read < _SNIFF_LIMIT:
+            chunk = f.read(min(_SNIFF_CHUNK_SIZE, _SNIFF_LIMIT - bytes_read))
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            
+            # Keep the end of the previous chunk so markers split across
+            # chunk boundaries are still found
+            window = tail + chunk
+            if any(marker in window for marker in _METADATA_MARKERS):
+                return True
+            tail = window[-overlap:]
+    
+    return False
 
 
 def get_metadata_for_album(album_directory: Path) -> Optional[Dict[str, Any]]:
@@ -357,6 +545,22 @@ def get_metadata_for_album(album_directory: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+def get_sacd_album_info(sacd_metadata: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Album-level fields of parsed SACD metadata.
+    
+    Album section values take priority and disc section values fill any
+    gaps. Returns a lookup view; no merged dictionary is built.
+    
+    Args:
+        sacd_metadata: Parsed metadata from parse_sacd_metadata_file
+    
+    Returns:
+        Read-only mapping of album/disc fields
+    """
+    return ChainMap(sacd_metadata.get('album') or {}, sacd_metadata.get('disc') or {})
+
+
 def write_sacd_metadata_to_flac(
     flac_file: Path,
     sacd_metadata: Dict[str, Any],
@@ -372,6 +576,7 @@ def write_sacd_metadata_to_flac(
     - ARTIST, ALBUM, TITLE (for track info)
     
     Only writes fields that are missing in the FLAC file (doesn't overwrite).
+    This is the single-file form of write_sacd_metadata_batch.
     
     Args:
         flac_file: Path to FLAC file
@@ -381,83 +586,96 @@ def write_sacd_metadata_to_flac(
     Returns:
         True if successful, False otherwise
     """
-    if not FLAC:
-        print("Warning: mutagen not available, cannot write FLAC metadata")
-        return False
+    return write_sacd_metadata_batch(
+        [(flac_file, sacd_metadata, track_number)]
+    ).get(flac_file, False)
+
+
+def write_sacd_metadata_batch(
+    writes: List[Tuple[Path, Dict[str, Any], Optional[int]]]
+) -> Dict[Path, bool]:
+    """
+    Write SACD metadata to several FLAC files, loading and saving each file once.
     
-    if not flac_file or not flac_file.exists():
-        return False
+    Applies the same rules as write_sacd_metadata_to_flac. When several
+    writes target the same file they are applied in order to one loaded
+    FLAC object, which is then saved once.
     
-    if not flac_file.is_file():
-        return False
+    Args:
+        writes: List of (flac_file, sacd_metadata, track_number) tuples
     
-    if sacd_metadata is None:
-        return False
+    Returns:
+        Dictionary mapping each FLAC file to True if successful, False otherwise
+    """
+    if not FLAC:
+        print("Warning: mutagen not available, cannot write FLAC metadata")
+        return {flac_file: False for flac_file, _, _ in writes}
     
-    try:
-        # Load FLAC file
-        audio = FLAC(str(flac_file))
-        
-        # Get disc/album metadata (prefer album over disc)
-        sacd_info = sacd_metadata.get('album', {}) or sacd_metadata.get('disc', {})
-        
-        if sacd_info:
-            # Write LABEL (Publisher → LABEL)
-            if 'label' in sacd_info and sacd_info['label']:
-                if 'label' not in audio:
-                    audio['label'] = sacd_info['label']
-            
-            # Write CATALOGNUMBER (Disc Catalog Number → CATALOGNUMBER)
-            if 'catalog_number' in sacd_info and sacd_info['catalog_number']:
-                if 'catalognumber' not in audio:
-                    audio['catalognumber'] = sacd_info['catalog_number']
-            
-            # Write GENRE (Disc Genre → GENRE)
-            if 'genre' in sacd_info and sacd_info['genre']:
-                if 'genre' not in audio:
-                    audio['genre'] = sacd_info['genre']
-            
-            # Write ARTIST (album artist)
-            if 'artist' in sacd_info and sacd_info['artist']:
-                if 'artist' not in audio:
-                    audio['artist'] = sacd_info['artist']
-                # Also set ALBUMARTIST if not present
-                if 'albumartist' not in audio:
-                    audio['albumartist'] = sacd_info['artist']
-            
-            # Write ALBUM (album title)
-            if 'title' in sacd_info and sacd_info['title']:
-                if 'album' not in audio:
-                    audio['album'] = sacd_info['title']
-        
-        # Write track-specific metadata if track_number provided
-        if track_number is not None and 'tracks' in sacd_metadata:
-            for track in sacd_metadata['tracks']:
-                if track.get('track_number') == track_number:
-                    # Write TITLE
-                    if 'title' in track and track['title']:
-                        if 'title' not in audio:
-                            audio['title'] = track['title']
-                    
-                    # Write ARTIST (track artist, always use track artist if available)
-                    if 'artist' in track and track['artist']:
-                        # Track artist overrides album artist
-                        audio['artist'] = track['artist']
-                    
-                    # Write TRACKNUMBER
-                    if 'tracknumber' not in audio:
-                        audio['tracknumber'] = str(track_number)
-                    
-                    break
-        
-        # Save changes (even if no metadata was written, to ensure file validity)
-        audio.save()
-        return True
+    # Group writes by file, keeping their order
+    pending: Dict[Path, List[Tuple[Dict[str, Any], Optional[int]]]] = {}
+    for flac_file, sacd_metadata, track_number in writes:
+        updates = pending.setdefault(flac_file, [])
+        if sacd_metadata is not None:
+            updates.append((sacd_metadata, track_number))
+    
+    results = {}
+    for flac_file, updates in pending.items():
+        if not updates or not flac_file or not flac_file.is_file():
+            results[flac_file] = False
+            continue
         
-    except PermissionError as e:
-        print(f"Error: Permission denied writing to {flac_file}: {e}")
-        return False
-    except Exception as e:
-        print(f"Error writing SACD metadata to {flac_file}: {e}")
-        return False
+        try:
+            audio = FLAC(str(flac_file))
+            for sacd_metadata, track_number in updates:
+                _apply_sacd_metadata(audio, sacd_metadata, track_number)
+            # Save even if no metadata was written, to ensure file validity
+            audio.save()
+            results[flac_file] = True
+        except PermissionError as e:
+            print(f"Error: Permission denied writing to {flac_file}: {e}")
+            results[flac_file] = False
+        except Exception as e:
+            print(f"Error writing SACD metadata to {flac_file}: {e}")
+            results[flac_file] = False
+    
+    return results
+
 
+def _apply_sacd_metadata(
+    audio: Any,
+    sacd_metadata: Dict[str, Any],
+    track_number: Optional[int] = None
+) -> None:
+    """Set missing Vorbis comment fields on a loaded FLAC from SACD metadata."""
+    # Existing tags are never overwritten (except ARTIST by a track artist),
+    # so work out once which of the tags we write are missing
+    missing = _SACD_TAG_KEYS.difference(audio.keys())
+    
+    # Get disc/album metadata (album fields first, disc fields fill gaps)
+    sacd_info = get_sacd_album_info(sacd_metadata)
+    
+    # LABEL, CATALOGNUMBER, GENRE, ARTIST/ALBUMARTIST and ALBUM
+    for tag, field in _ALBUM_TAG_FIELDS:
+        if tag in missing:
+            value = sacd_info.get(field)
+            if value:
+                audio[tag] = value
+    
+    # Write track-specific metadata if track_number provided
+    if track_number is not None and 'tracks' in sacd_metadata:
+        for track in sacd_metadata['tracks']:
+            if track.get('track_number') == track_number:
+                # Write TITLE
+                if 'title' in missing and track.get('title'):
+                    audio['title'] = track['title']
+                
+                # Write ARTIST (track artist, always use track artist if available)
+                if track.get('artist'):
+                    # Track artist overrides album artist
+                    audio['artist'] = track['artist']
+                
+                # Write TRACKNUMBER
+                if 'tracknumber' in missing:
+                    audio['tracknumber'] = str(track_number)
+                
+                break
@@ -4,27 +4,61 @@ Identifies albums and organizes files for conversion.
 """
 
 import os
+import sys
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Set, Dict, Optional
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
 
 from src.album_metadata import AlbumMetadata
 
 
-@dataclass
+def _extension(name: str) -> str:
+    """
+    Lowercased extension of a file name, with the same rules as Path.suffix.
+    
+    Works on the raw name string so the scan loop doesn't build a Path
+    for every directory entry just to classify it.
+    """
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ''
+
+
+@dataclass(slots=True, frozen=True)
 class MusicFile:
     """Represents a music file to be converted."""
     path: Path
     relative_path: Path  # Relative to album root
     extension: str
-    size: int = 0
+    # Known size (e.g. from the scan's directory entry); stat()ed on first
+    # use of .size when not given
+    size: InitVar[Optional[int]] = None
+    _size: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        if self.path.exists():
-            self.size = self.path.stat().st_size
+    def __post_init__(self, size: Optional[int]):
+        object.__setattr__(self, '_size', size)
+
+
+def _music_file_size(self: MusicFile) -> int:
+    """File size in bytes, or 0 if the file doesn't exist."""
+    if self._size is None:
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            size = 0
+        object.__setattr__(self, '_size', size)
+    return self._size
 
 
-@dataclass
+# Attached after the class body: a property defined inside it would become
+# the default value of the 'size' init parameter
+MusicFile.size = property(_music_file_size)
+
+
+@dataclass(slots=True, frozen=True)
 class NonMusicFile:
     """Represents a non-music file to be copied."""
     path: Path
@@ -32,9 +66,13 @@ class NonMusicFile:
     extension: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Album:
-    """Represents an album with music and non-music files."""
+    """
+    Represents an album with music and non-music files.
+    
+    Not frozen: album_id is reassigned when a resumed album is rescanned.
+    """
     root_path: Path
     name: str
     music_files: List[MusicFile] = field(default_factory=list)
@@ -43,11 +81,19 @@ class Album:
     album_id: Optional[str] = None
     already_processed: bool = False
     audio_checksum: Optional[str] = None
+    _total_size: Optional[int] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def total_size(self) -> int:
-        """Total size of music files in bytes."""
-        return sum(f.size for f in self.music_files)
+        """
+        Total size of music files in bytes.
+        
+        Computed on first access: the file list is fixed once the album
+        has been scanned, and summaries read this for every album.
+        """
+        if self._total_size is None:
+            self._total_size = sum(f.size for f in self.music_files)
+        return self._total_size
     
     @property
     def file_count(self) -> int:
@@ -72,7 +118,9 @@ class DirectoryScanner:
         self,
         music_extensions: Optional[List[str]] = None,
         copy_extensions: Optional[List[str]] = None,
-        check_metadata: bool = True
+        check_metadata: bool = True,
+        max_workers: int = 4,
+        include_hidden: bool = False
     ):
         """
         Initialize scanner.
@@ -81,17 +129,21 @@ class DirectoryScanner:
             music_extensions: File extensions for music files (e.g., ['.iso', '.dsf'])
             copy_extensions: File extensions for non-music files to copy
             check_metadata: Whether to check for .album_metadata files
+            max_workers: Threads used to scan albums concurrently
+            include_hidden: Whether to include dotfiles and dot-directories
         """
-        self.music_extensions = set(
-            ext.lower() for ext in (music_extensions or ['.iso', '.dsf', '.dff'])
+        self.music_extensions = frozenset(
+            sys.intern(ext.lower()) for ext in (music_extensions or ['.iso', '.dsf', '.dff'])
         )
-        self.copy_extensions = set(
-            ext.lower() for ext in (copy_extensions or [
+        self.copy_extensions = frozenset(
+            sys.intern(ext.lower()) for ext in (copy_extensions or [
                 '.jpg', '.jpeg', '.png', '.pdf', '.txt', 
                 '.log', '.cue', '.m3u', '.nfo'
             ])
         )
         self.check_metadata = check_metadata
+        self.max_workers = max(1, max_workers)
+        self.include_hidden = include_hidden
     
     def scan(self, root_dir: Path, single_album: bool = False) -> List[Album]:
         """
@@ -134,29 +186,60 @@ class DirectoryScanner:
         Returns:
             List of Album objects
         """
-        albums = []
+        album_dirs = []
+        skip_hidden = not self.include_hidden
+        pending = [str(root_dir)]
         
-        # Walk through directory tree
-        for dirpath, dirnames, filenames in os.walk(root_dir):
-            current_path = Path(dirpath)
+        # Walk the tree with scandir so directory entries carry their type
+        # and no per-file stat() is needed to classify them. Each directory
+        # is listed once and decided on the spot; nothing is revisited.
+        while pending:
+            dirpath = pending.pop()
+            subdirs = []
+            has_music = False
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError:
+                continue
             
-            # Check if current directory contains music files
-            has_music = any(
-                Path(dirpath, f).suffix.lower() in self.music_extensions
-                for f in filenames
-            )
+            for entry in entries:
+                # Name check first: hidden entries never cost a type lookup
+                if skip_hidden and entry.name[0] == '.':
+                    continue
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif not has_music and _extension(entry.name) in self.music_extensions:
+                    has_music = True
             
             if has_music:
-                # This is an album directory
-                album = self._scan_album(current_path, root_dir)
-                if album.file_count > 0:
-                    albums.append(album)
-                
-                # Don't descend into this directory's subdirectories
-                # as they're part of this album
-                dirnames.clear()
+                # This is an album directory. Don't descend into its
+                # subdirectories as they're part of this album. Its listing
+                # is handed on so the album root isn't read a second time;
+                # a flat album needs no further directory reads at all.
+                album_dirs.append((Path(dirpath), entries))
+                continue
+            
+            # Keep os.walk's top-down order
+            pending.extend(reversed(subdirs))
         
-        return albums
+        # Albums are independent, so their directory I/O can overlap.
+        # map() keeps the results in discovery order.
+        if len(album_dirs) > 1 and self.max_workers > 1:
+            workers = min(self.max_workers, len(album_dirs))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                scanned = list(executor.map(
+                    lambda found: self._scan_album(found[0], root_dir, listing=found[1]),
+                    album_dirs
+                ))
+        else:
+            scanned = [
+                self._scan_album(album_path, root_dir, listing=entries)
+                for album_path, entries in album_dirs
+            ]
+        
+        return [album for album in scanned if album.file_count > 0]
     
     def _is_album(self, directory: Path) -> bool:
         """
@@ -168,55 +251,125 @@ class DirectoryScanner:
         Returns:
             True if directory or its subdirectories contain music files
         """
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if Path(file).suffix.lower() in self.music_extensions:
-                    return True
+        music_extensions = self.music_extensions
+        skip_hidden = not self.include_hidden
+        
+        # Breadth-first, returning on the first music file: music sits at the
+        # top of an album or one disc folder down, so deep artwork or scan
+        # trees are usually never listed
+        pending = deque([str(directory)])
+        while pending:
+            try:
+                with os.scandir(pending.popleft()) as entries:
+                    for entry in entries:
+                        if skip_hidden and entry.name[0] == '.':
+                            continue
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                pending.append(entry.path)
+                        elif _extension(entry.name) in music_extensions:
+                            return True
+            except OSError:
+                continue
         return False
     
-    def _scan_album(self, album_path: Path, root_dir: Path) -> Album:
+    def _scan_album(
+        self,
+        album_path: Path,
+        root_dir: Path,
+        listing: Optional[List[os.DirEntry]] = None
+    ) -> Album:
         """
         Scan a single album directory.
         
         Args:
             album_path: Path to album directory
             root_dir: Root directory for relative path calculation
+            listing: Entries of album_path already read by the caller, if any
             
         Returns:
             Album object
         """
-        music_files = []
-        non_music_files = []
+        # Files are gathered as raw (path, relative_path, extension[, size])
+        # tuples and only turned into Path-backed records once, after sorting
+        music_entries = []
+        non_music_entries = []
         subdirs = set()
         
+        music_extensions = self.music_extensions
+        copy_extensions = self.copy_extensions
+        skip_hidden = not self.include_hidden
+        intern = sys.intern
+        
+        album_dir = str(album_path)
+        # Relative paths are sliced off the entry path; no Path per file
+        prefix_len = len(os.path.join(album_dir, ''))
+        pending = [album_dir]
+        
         # Walk through album directory and subdirectories
-        for dirpath, dirnames, filenames in os.walk(album_path):
-            current_path = Path(dirpath)
+        while pending:
+            dirpath = pending.pop()
+            if listing is not None and dirpath == album_dir:
+                entries = listing
+            else:
+                try:
+                    with os.scandir(dirpath) as it:
+                        entries = list(it)
+                except OSError:
+                    continue
             
-            # Track subdirectories
-            if current_path != album_path:
-                relative_dir = current_path.relative_to(album_path)
-                subdirs.add(str(relative_dir.parts[0]))
+            # Track top-level subdirectories
+            at_root = dirpath == album_dir
             
-            # Process files
-            for filename in filenames:
-                file_path = current_path / filename
-                extension = file_path.suffix.lower()
-                relative_path = file_path.relative_to(album_path)
+            for entry in entries:
+                if skip_hidden and entry.name[0] == '.':
+                    continue
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        pending.append(entry.path)
+                        if at_root:
+                            subdirs.add(entry.name)
+                    continue
                 
-                if extension in self.music_extensions:
-                    music_files.append(MusicFile(
-                        path=file_path,
-                        relative_path=relative_path,
-                        extension=extension
-                    ))
-                elif extension in self.copy_extensions or extension == '':
+                # Process files
+                entry_path = entry.path
+                # Interned: a library repeats a handful of extensions
+                # across every file it holds
+                extension = intern(_extension(entry.name))
+                
+                if extension in music_extensions:
+                    # One stat per kept music file; albums already
+                    # overlap their I/O on the scan thread pool, so
+                    # there is no separate batched-stat path. A
+                    # dir_fd-relative stat (os.fwalk) measured no faster
+                    # and would lose the reusable DirEntry listings.
+                    try:
+                        size = entry.stat().st_size
+                    except OSError:
+                        size = 0
+                    music_entries.append(
+                        (entry_path, entry_path[prefix_len:], extension, size)
+                    )
+                elif extension in copy_extensions or extension == '':
                     # Include extensionless files (like README)
-                    non_music_files.append(NonMusicFile(
-                        path=file_path,
-                        relative_path=relative_path,
-                        extension=extension
-                    ))
+                    non_music_entries.append(
+                        (entry_path, entry_path[prefix_len:], extension)
+                    )
+        
+        # Files from every subdirectory were collected into flat lists, so
+        # each list is ordered exactly once, in place, on the path strings.
+        # Paths are unique, so tuple comparison never looks past them.
+        music_entries.sort()
+        non_music_entries.sort()
+        
+        music_files = [
+            MusicFile(path=Path(path), relative_path=Path(relative_path), extension=extension, size=size)
+            for path, relative_path, extension, size in music_entries
+        ]
+        non_music_files = [
+            NonMusicFile(path=Path(path), relative_path=Path(relative_path), extension=extension)
+            for path, relative_path, extension in non_music_entries
+        ]
         
         # Check for album metadata file
         album_id = None
@@ -236,9 +389,9 @@ class DirectoryScanner:
         return Album(
             root_path=album_path,
             name=album_path.name,
-            music_files=sorted(music_files, key=lambda x: str(x.path)),
-            non_music_files=sorted(non_music_files, key=lambda x: str(x.path)),
-            subdirectories=sorted(list(subdirs)),
+            music_files=music_files,
+            non_music_files=non_music_files,
+            subdirectories=sorted(subdirs),
             album_id=album_id,
             already_processed=already_processed,
             audio_checksum=audio_checksum
@@ -254,21 +407,22 @@ class DirectoryScanner:
         Returns:
             Dictionary with statistics
         """
-        total_files = sum(album.file_count for album in albums)
-        total_size = sum(album.total_size for album in albums)
+        total_files = 0
+        total_size = 0
+        extensions = Counter()
         
-        extensions = {}
+        # One pass over the albums; sizes come from the memoized total
         for album in albums:
-            for file in album.music_files:
-                ext = file.extension
-                extensions[ext] = extensions.get(ext, 0) + 1
+            total_files += album.file_count
+            total_size += album.total_size
+            extensions.update(file.extension for file in album.music_files)
         
         return {
             'album_count': len(albums),
             'total_files': total_files,
             'total_size_bytes': total_size,
             'total_size_gb': total_size / (1024**3),
-            'extensions': extensions
+            'extensions': dict(extensions)
         }
     
     def print_summary(self, albums: List[Album]):
@@ -14,6 +14,11 @@ from datetime import datetime
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class AlbumStatus(Enum):
     """Status of album processing."""
@@ -160,8 +165,18 @@ class StateManager:
             return None
         
         try:
-            with open(self.state_file, 'r') as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(self.state_file, 'rb') as f:
+                    raw = f.read()
+                try:
+                    data = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    # orjson rejects the lone surrogate escapes json writes
+                    # for non-UTF-8 paths; json reads them back as-is
+                    data = json.loads(raw.decode('utf-8'))
+            else:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
             # Reconstruct session
             albums = [
@@ -252,8 +267,20 @@ class StateManager:
         
         # Write to file (atomic write)
         temp_file = self.state_file.with_suffix('.tmp')
-        with open(temp_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        payload = None
+        if orjson is not None:
+            try:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            except TypeError:
+                # orjson.JSONEncodeError: surrogate-escaped str from
+                # os.fsdecode on non-UTF-8 filenames; json handles those
+                payload = None
+        if payload is not None:
+            with open(temp_file, 'wb') as f:
+                f.write(payload)
+        else:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
         
         # Atomic replace
         temp_file.replace(self.state_file)
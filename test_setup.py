@@ -13,11 +13,11 @@ def check_python_version():
     """Check Python version."""
     print("Checking Python version...")
     version = sys.version_info
-    if version.major >= 3 and version.minor >= 9:
+    if (version.major, version.minor) >= (3, 10):
         print(f"  ✓ Python {version.major}.{version.minor}.{version.micro}")
         return True
     else:
-        print(f"  ✗ Python {version.major}.{version.minor}.{version.micro} (3.9+ required)")
+        print(f"  ✗ Python {version.major}.{version.minor}.{version.micro} (3.10+ required)")
         return False
 
 
@@ -7,14 +7,11 @@ import sys
 import pytest
 import tempfile
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Optional
 from unittest.mock import Mock, MagicMock
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-
 # ============================================================================
 # Test Environment Configuration
 # ============================================================================
@@ -48,26 +45,40 @@ def test_album_path() -> Path:
 # Temporary Directory Fixtures
 # ============================================================================
 
+# Input fixtures write many tiny files; keep them in RAM when a tmpfs is
+# available. Output and archive directories can receive full album copies
+# and conversions, so they stay on the default temp root.
+_FAST_TMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+
+@contextmanager
+def _make_temp_dir(root: Optional[str] = None) -> Generator[Path, None, None]:
+    """Create a temporary directory under root and remove it afterwards."""
+    temp_path = Path(tempfile.mkdtemp(prefix="dsd_test_", dir=root))
+    try:
+        yield temp_path
+    finally:
+        if temp_path.exists():
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+
 @pytest.fixture
 def temp_dir() -> Generator[Path, None, None]:
     """
     Create a temporary directory for test outputs.
     Automatically cleaned up after test.
     """
-    temp_path = Path(tempfile.mkdtemp(prefix="dsd_test_"))
-    try:
+    with _make_temp_dir() as temp_path:
         yield temp_path
-    finally:
-        if temp_path.exists():
-            shutil.rmtree(temp_path, ignore_errors=True)
 
 
 @pytest.fixture
-def temp_input_dir(temp_dir) -> Path:
-    """Temporary input directory."""
-    input_path = temp_dir / "input"
-    input_path.mkdir(parents=True, exist_ok=True)
-    return input_path
+def temp_input_dir() -> Generator[Path, None, None]:
+    """Temporary input directory (on tmpfs when available)."""
+    with _make_temp_dir(_FAST_TMP_ROOT) as temp_path:
+        input_path = temp_path / "input"
+        input_path.mkdir(parents=True, exist_ok=True)
+        yield input_path
 
 
 @pytest.fixture
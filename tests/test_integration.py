@@ -7,10 +7,6 @@ import pytest
 import shutil
 from pathlib import Path
 from unittest.mock import patch, Mock
-import sys
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from scanner import DirectoryScanner
 from archiver import Archiver
@@ -2,19 +2,20 @@
 Tests for SACD metadata parser functionality.
 """
 
+import io
 import pytest
 from pathlib import Path
+import shutil
 import tempfile
-import sys
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+import sacd_metadata_parser
 from sacd_metadata_parser import (
     parse_sacd_metadata_file,
     find_sacd_metadata_files,
+    get_sacd_album_info,
     get_metadata_for_album,
     write_sacd_metadata_to_flac,
+    write_sacd_metadata_batch,
     _parse_disc_info,
     _parse_album_info,
     _parse_track_list
@@ -26,6 +27,22 @@ try:
 except ImportError:
     MUTAGEN_AVAILABLE = False
 
+try:
+    import numpy as np
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+# 0.1 seconds of 16-bit mono silence at 44.1kHz, written when soundfile is unavailable
+_SILENT_FLAC_BYTES = (
+    b'fLaC\x00\x00\x00"\x10\x00\x10\x00\x00\x00\x0b\x00\x00\r\n\xc4@\xf0\x00\x00'
+    b'\x11:\xeawY\xa6\xe8\x11\xe6\xdf,X}R\xb7\x95\xa16\x84\x00\x00( \x00'
+    b'\x00\x00reference libFLAC 1.4.'
+    b'3 20230623\x00\x00\x00\x00\xff\xf8\xc9\x08\x00\x95\x00\x00\x00!'
+    b'\xbd\xff\xf8y\x08\x01\x019\xb0\x00\x00\x00\xf5\x06'
+)
+
 
 SAMPLE_SACD_METADATA = """
 
@@ -88,6 +105,9 @@ Area count: 1
 
 """
 
+# Encoded once so file-based tests don't re-encode the sample
+_SAMPLE_BYTES = SAMPLE_SACD_METADATA.encode('utf-8')
+
 
 class TestSACDMetadataParser:
     """Tests for SACD metadata parsing."""
@@ -128,6 +148,20 @@ class TestSACDMetadataParser:
         assert album_info['artist'] == 'Charles Mingus'
         assert album_info['label'] == 'Analogue Productions'
     
+    def test_parse_info_field_rules(self):
+        """Test first value wins, blank values and unknown fields are skipped."""
+        section = """
+	Disc Genre:
+	Disc Genre: Jazz
+	Disc Genre: Blues
+	Disc Category: General
+	Album Genre: Rock
+	Locale: en, Code character set:[1], ISO646-JP
+"""
+        disc_info = _parse_disc_info(section)
+        
+        assert disc_info == {'genre': 'Jazz'}
+    
     def test_parse_track_list(self):
         """Test parsing of track list."""
         tracks = _parse_track_list(SAMPLE_SACD_METADATA)
@@ -151,14 +185,13 @@ class TestSACDMetadataParser:
         assert tracks[5]['track_number'] == 6
         assert tracks[5]['title'] == "E's Flat Ah's Flat Too"
         assert tracks[5]['duration_seconds'] == 6 * 60 + 46  # 6:46
-    
-    def test_parse_full_sacd_metadata_file(self, tmp_path):
-        """Test parsing complete SACD metadata file."""
-        # Create a temporary metadata file
-        metadata_file = tmp_path / "sacd_metadata.txt"
-        metadata_file.write_text(SAMPLE_SACD_METADATA)
         
-        metadata = parse_sacd_metadata_file(metadata_file)
+        # Repeated performer strings are shared rather than duplicated
+        assert tracks[0]['artist'] is tracks[5]['artist']
+    
+    def test_parse_full_sacd_metadata_file(self):
+        """Test parsing complete SACD metadata from an open stream."""
+        metadata = parse_sacd_metadata_file(io.StringIO(SAMPLE_SACD_METADATA))
         
         assert metadata is not None
         assert 'disc' in metadata
@@ -181,6 +214,62 @@ class TestSACDMetadataParser:
         assert metadata['tracks'][0]['title'] == 'Wednesday Night Prayer Meeting'
         assert metadata['tracks'][1]['title'] == "Cryin' Blues"
     
+    def test_parse_bytes(self):
+        """Test parsing SACD metadata passed as raw bytes."""
+        metadata = parse_sacd_metadata_file(_SAMPLE_BYTES)
+        
+        assert metadata is not None
+        assert metadata['album']['catalog_number'] == 'CAPJ0000'
+        assert len(metadata['tracks']) == 6
+    
+    def test_parse_stops_after_expected_tracks(self, tmp_path):
+        """Test that areas after the first complete track list are ignored."""
+        trailing_area = """
+	Area Information [1]:
+	Track Count: 1
+	Track list [1]:
+		Title[0]: Multichannel Track
+		Performer[0]: Someone Else
+		Duration: 01:00:00 [mins:secs:frames]
+"""
+        metadata_file = tmp_path / "sacd_metadata.txt"
+        metadata_file.write_bytes(_SAMPLE_BYTES + trailing_area.encode('utf-8'))
+        
+        metadata = parse_sacd_metadata_file(metadata_file)
+        
+        assert metadata is not None
+        assert len(metadata['tracks']) == 6
+        assert metadata['tracks'][5]['title'] == "E's Flat Ah's Flat Too"
+        assert all(t['title'] != 'Multichannel Track' for t in metadata['tracks'])
+    
+    def test_parse_metadata_file_path(self, tmp_path):
+        """Test parsing complete SACD metadata from a file path."""
+        metadata_file = tmp_path / "sacd_metadata.txt"
+        metadata_file.write_bytes(_SAMPLE_BYTES)
+        
+        metadata = parse_sacd_metadata_file(metadata_file)
+        
+        assert metadata is not None
+        assert metadata['disc']['title'] == 'Blues & Roots'
+        assert len(metadata['tracks']) == 6
+    
+    def test_parse_cached_until_file_changes(self, tmp_path):
+        """Test repeated parses reuse the cache but see edits to the file."""
+        metadata_file = tmp_path / "sacd_metadata.txt"
+        metadata_file.write_text("Disc Information:\n\tTitle: First\n")
+        
+        first = parse_sacd_metadata_file(metadata_file)
+        first['disc']['title'] = 'Mutated by caller'
+        second = parse_sacd_metadata_file(metadata_file)
+        
+        # Callers get independent copies of the cached result
+        assert second['disc']['title'] == 'First'
+        
+        metadata_file.write_text("Disc Information:\n\tTitle: Second Edition\n")
+        third = parse_sacd_metadata_file(metadata_file)
+        
+        assert third['disc']['title'] == 'Second Edition'
+    
     def test_parse_nonexistent_file(self, tmp_path):
         """Test parsing returns None for nonexistent file."""
         metadata_file = tmp_path / "nonexistent.txt"
@@ -215,11 +304,43 @@ class TestSACDMetadataParser:
         assert "SACD_info.txt" in file_names
         assert "album_metadata.txt" in file_names
     
+    def test_find_sacd_metadata_files_long_preamble(self, tmp_path):
+        """Test markers past the first read chunk are still found."""
+        preamble = "sacd_extract log line\n" * 500  # ~11KB before the marker
+        (tmp_path / "dump.txt").write_text(preamble + "Disc Information:\nTitle: Test")
+        
+        metadata_files = find_sacd_metadata_files(tmp_path)
+        
+        assert [f.name for f in metadata_files] == ["dump.txt"]
+    
+    def test_find_sacd_metadata_files_sees_new_files(self, tmp_path):
+        """Test cached directory scans pick up files added later."""
+        (tmp_path / "SACD_info.txt").write_text("Disc Information:\nTitle: Test")
+        assert len(find_sacd_metadata_files(tmp_path)) == 1
+        
+        (tmp_path / "album_metadata.txt").write_text("Album Information:\nTitle: Test")
+        file_names = sorted(f.name for f in find_sacd_metadata_files(tmp_path))
+        
+        assert file_names == ["SACD_info.txt", "album_metadata.txt"]
+    
+    def test_find_sacd_metadata_files_sees_rewritten_files(self, tmp_path):
+        """Test files rewritten in place are checked again."""
+        candidate = tmp_path / "notes.txt"
+        candidate.write_text("Regular text file")
+        assert find_sacd_metadata_files(tmp_path) == []
+        
+        # Same directory listing, so the directory mtime does not change
+        candidate.write_text("Disc Information:\nTitle: Test")
+        assert [f.name for f in find_sacd_metadata_files(tmp_path)] == ["notes.txt"]
+        
+        candidate.write_text("Regular text file again")
+        assert find_sacd_metadata_files(tmp_path) == []
+    
     def test_get_metadata_for_album(self, tmp_path):
         """Test getting metadata for an album directory."""
         # Create a metadata file in the album directory
         metadata_file = tmp_path / "sacd_info.txt"
-        metadata_file.write_text(SAMPLE_SACD_METADATA)
+        metadata_file.write_bytes(_SAMPLE_BYTES)
         
         metadata = get_metadata_for_album(tmp_path)
         
@@ -302,6 +423,29 @@ class TestSACDMetadataParserErrorHandling:
         metadata = parse_sacd_metadata_file(large_file)
         assert metadata is not None  # Small file should work
     
+    def test_parse_file_over_size_limit(self, tmp_path, monkeypatch):
+        """Test files over the size limit are skipped without being parsed."""
+        monkeypatch.setattr(sacd_metadata_parser, 'MAX_METADATA_FILE_SIZE', 16)
+        large_file = tmp_path / "large.txt"
+        large_file.write_text("Disc Information:\nTitle: Test")
+        
+        metadata = parse_sacd_metadata_file(large_file)
+        assert metadata is None
+    
+    def test_stream_size_limit_counts_bytes(self, monkeypatch):
+        """Test the read cap on streams counts UTF-8 bytes, not characters."""
+        monkeypatch.setattr(sacd_metadata_parser, 'MAX_METADATA_FILE_SIZE', 1000)
+        # 400 characters, 1200 bytes: under the limit in characters only
+        text = (
+            "Disc Information:\n\tTitle: " + "あ" * 400 + "\n"
+            "Album Information:\n\tTitle: Album\n"
+        )
+        
+        metadata = parse_sacd_metadata_file(io.StringIO(text))
+        
+        assert metadata is not None
+        assert metadata['album'] == {}
+    
     def test_parse_directory_not_file(self, tmp_path):
         """Test parsing handles directory instead of file."""
         directory = tmp_path / "not_a_file"
@@ -398,6 +542,22 @@ Disc Information:
         tracks = _parse_track_list(None)
         assert tracks == []
     
+    def test_parse_track_list_out_of_order_and_out_of_range(self):
+        """Test tracks are returned by index and absurd indices are ignored."""
+        content = """
+Title[1]: Second Track
+Duration: 02:00:00
+Title[999999]: Corrupt Track
+Duration: 09:00:00
+Title[0]: First Track
+Duration: 01:00:00
+"""
+        tracks = _parse_track_list(content)
+        
+        assert [t['title'] for t in tracks] == ['First Track', 'Second Track']
+        assert tracks[0]['duration_seconds'] == 60
+        assert tracks[1]['duration_seconds'] == 120
+    
     def test_parse_track_with_missing_performer(self):
         """Test track parsing when performer is missing."""
         content = """
@@ -446,45 +606,37 @@ Track list [0]:
         assert metadata['tracks'][0]['title'] == 'Jóga'
 
 
+def create_dummy_flac(path: Path) -> Path:
+    """Create a minimal valid FLAC file (0.1 seconds of silence) for testing."""
+    if SOUNDFILE_AVAILABLE:
+        samples = np.zeros(int(44100 * 0.1), dtype='int16')
+        sf.write(str(path), samples, 44100, format='FLAC', subtype='PCM_16')
+    else:
+        path.write_bytes(_SILENT_FLAC_BYTES)
+    
+    return path
+
+
+@pytest.fixture(scope="session")
+def flac_template(tmp_path_factory) -> Path:
+    """Silent FLAC file encoded once per session."""
+    return create_dummy_flac(tmp_path_factory.mktemp("flac") / "template.flac")
+
+
+@pytest.fixture
+def flac_file(flac_template, tmp_path) -> Path:
+    """Fresh copy of the template FLAC file for a single test."""
+    path = tmp_path / "test.flac"
+    shutil.copyfile(flac_template, path)
+    return path
+
+
 @pytest.mark.skipif(not MUTAGEN_AVAILABLE, reason="mutagen not available")
 class TestWriteSACDMetadataToFLAC:
     """Tests for writing SACD metadata to FLAC files."""
     
-    def create_dummy_flac(self, path: Path) -> Path:
-        """Create a minimal valid FLAC file for testing."""
-        import subprocess
-        # Create a 1-second silent FLAC file using ffmpeg
-        result = subprocess.run([
-            'ffmpeg', '-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=mono', '-t', '0.1',
-            '-y', str(path)
-        ], capture_output=True, timeout=5)
-        
-        if result.returncode != 0:
-            # Fallback: create using Python's wave module and convert to FLAC
-            import wave
-            import struct
-            wav_path = path.with_suffix('.wav')
-            with wave.open(str(wav_path), 'w') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(44100)
-                # Write 0.1 seconds of silence
-                samples = [0] * int(44100 * 0.1)
-                wav_file.writeframes(struct.pack('h' * len(samples), *samples))
-            
-            # Convert WAV to FLAC
-            subprocess.run(['ffmpeg', '-i', str(wav_path), '-y', str(path)],
-                         capture_output=True, check=True, timeout=5)
-            wav_path.unlink()
-        
-        return path
-    
-    def test_write_basic_metadata(self, tmp_path):
+    def test_write_basic_metadata(self, flac_file):
         """Test writing basic SACD metadata to FLAC file."""
-        # Create a dummy FLAC file
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
-        
         # Create SACD metadata
         sacd_metadata = {
             'disc': {
@@ -511,11 +663,8 @@ class TestWriteSACDMetadataToFLAC:
         assert audio.get('artist') == ['Test Artist']
         assert audio.get('albumartist') == ['Test Artist']
     
-    def test_write_track_metadata(self, tmp_path):
+    def test_write_track_metadata(self, flac_file):
         """Test writing track-specific metadata."""
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
-        
         sacd_metadata = {
             'disc': {
                 'title': 'Test Album',
@@ -539,11 +688,8 @@ class TestWriteSACDMetadataToFLAC:
         assert audio.get('tracknumber') == ['2']
         assert audio.get('album') == ['Test Album']
     
-    def test_preserve_existing_metadata(self, tmp_path):
+    def test_preserve_existing_metadata(self, flac_file):
         """Test that existing metadata is preserved."""
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
-        
         # Add existing metadata
         audio = FLAC(str(flac_file))
         audio['title'] = 'Existing Title'
@@ -571,11 +717,8 @@ class TestWriteSACDMetadataToFLAC:
         assert audio.get('label') == ['New Label']  # New field should be added
         assert audio.get('album') == ['New Album']  # New field should be added
     
-    def test_write_with_album_metadata_priority(self, tmp_path):
+    def test_write_with_album_metadata_priority(self, flac_file):
         """Test that album metadata is preferred over disc metadata."""
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
-        
         sacd_metadata = {
             'disc': {
                 'title': 'Disc Title',
@@ -600,11 +743,41 @@ class TestWriteSACDMetadataToFLAC:
         assert audio.get('label') == ['Album Label']
         assert audio.get('catalognumber') == ['ALBUM-001']
     
-    def test_write_handles_missing_fields(self, tmp_path):
-        """Test writing with partial/missing metadata."""
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
+    def test_write_falls_back_to_disc_fields(self, flac_file):
+        """Test that disc fields fill gaps in album metadata."""
+        sacd_metadata = {
+            'disc': {
+                'title': 'Disc Title',
+                'genre': 'Jazz'
+            },
+            'album': {
+                'title': 'Album Title'
+            },
+            'tracks': []
+        }
+        
+        result = write_sacd_metadata_to_flac(flac_file, sacd_metadata)
+        
+        assert result is True
+        
+        audio = FLAC(str(flac_file))
+        assert audio.get('album') == ['Album Title']
+        assert audio.get('genre') == ['Jazz']
+    
+    def test_album_info_prefers_album_and_fills_from_disc(self):
+        """Test the shared album/disc lookup used by the writer and main.py."""
+        sacd_info = get_sacd_album_info({
+            'disc': {'title': 'Disc Title', 'genre': 'Jazz'},
+            'album': {'title': 'Album Title'},
+        })
         
+        assert sacd_info['title'] == 'Album Title'
+        assert sacd_info['genre'] == 'Jazz'
+        assert 'label' not in sacd_info
+        assert not get_sacd_album_info({'disc': {}, 'album': {}})
+    
+    def test_write_handles_missing_fields(self, flac_file):
+        """Test writing with partial/missing metadata."""
         # Minimal metadata
         sacd_metadata = {
             'disc': {
@@ -623,6 +796,64 @@ class TestWriteSACDMetadataToFLAC:
         assert audio.get('catalognumber') is None
         assert audio.get('genre') is None
     
+    def test_write_batch(self, flac_template, tmp_path):
+        """Test batch writing applies per-track metadata to each file."""
+        track1 = tmp_path / "01.flac"
+        track2 = tmp_path / "02.flac"
+        shutil.copyfile(flac_template, track1)
+        shutil.copyfile(flac_template, track2)
+        missing = tmp_path / "missing.flac"
+        
+        sacd_metadata = {
+            'album': {'title': 'Test Album', 'label': 'Test Label'},
+            'tracks': [
+                {'track_number': 1, 'title': 'Track 1'},
+                {'track_number': 2, 'title': 'Track 2'}
+            ]
+        }
+        
+        results = write_sacd_metadata_batch([
+            (track1, sacd_metadata, 1),
+            (track2, sacd_metadata, 2),
+            (missing, sacd_metadata, 3)
+        ])
+        
+        assert results == {track1: True, track2: True, missing: False}
+        assert FLAC(str(track1)).get('title') == ['Track 1']
+        assert FLAC(str(track2)).get('title') == ['Track 2']
+        assert FLAC(str(track2)).get('label') == ['Test Label']
+    
+    def test_write_batch_loads_and_saves_each_file_once(self, flac_file, monkeypatch):
+        """Test several writes to one file share a single load and save."""
+        loads = []
+        saves = []
+        
+        class CountingFLAC(FLAC):
+            def __init__(self, filename, *args, **kwargs):
+                loads.append(filename)
+                super().__init__(filename, *args, **kwargs)
+            
+            def save(self, *args, **kwargs):
+                saves.append(self.filename)
+                return super().save(*args, **kwargs)
+        
+        monkeypatch.setattr(sacd_metadata_parser, 'FLAC', CountingFLAC)
+        
+        results = write_sacd_metadata_batch([
+            (flac_file, {'album': {'title': 'Test Album'}}, None),
+            (flac_file, {'album': {'label': 'Test Label'}}, None),
+            (flac_file, {'disc': {'genre': 'Jazz'}}, None)
+        ])
+        
+        assert results == {flac_file: True}
+        assert loads == [str(flac_file)]
+        assert saves == [str(flac_file)]
+        
+        audio = FLAC(str(flac_file))
+        assert audio.get('album') == ['Test Album']
+        assert audio.get('label') == ['Test Label']
+        assert audio.get('genre') == ['Jazz']
+    
     def test_write_fails_for_nonexistent_file(self, tmp_path):
         """Test that writing fails gracefully for nonexistent files."""
         flac_file = tmp_path / "nonexistent.flac"
@@ -647,21 +878,15 @@ class TestWriteSACDMetadataToFLAC:
         
         assert result is False
     
-    def test_write_with_empty_metadata(self, tmp_path):
+    def test_write_with_empty_metadata(self, flac_file):
         """Test writing with empty metadata."""
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
-        
         result = write_sacd_metadata_to_flac(flac_file, {})
         
         # Should succeed but not write anything
         assert result is True
     
-    def test_write_with_none_metadata(self, tmp_path):
+    def test_write_with_none_metadata(self, flac_file):
         """Test writing with None metadata."""
-        flac_file = tmp_path / "test.flac"
-        self.create_dummy_flac(flac_file)
-        
         result = write_sacd_metadata_to_flac(flac_file, None)
         
         assert result is False
@@ -2,9 +2,13 @@
 Unit tests for scanner module (DirectoryScanner, Album, MusicFile).
 """
 
+import dataclasses
 import pytest
+from collections import Counter
 from pathlib import Path
-from scanner import DirectoryScanner, Album, MusicFile, NonMusicFile
+
+import scanner as scanner_module
+from scanner import DirectoryScanner, Album, MusicFile, NonMusicFile, _extension
 
 
 class TestMusicFile:
@@ -46,6 +50,43 @@ class TestMusicFile:
         )
         
         assert music_file.size == 0  # Non-existent file has size 0
+    
+    def test_music_file_is_frozen(self, sample_album_structure):
+        """Test that MusicFile is an immutable, slotted record."""
+        music_file = MusicFile(
+            path=sample_album_structure / "01 - Track One.dsf",
+            relative_path=Path("01 - Track One.dsf"),
+            extension=".dsf"
+        )
+        
+        assert not hasattr(music_file, '__dict__')
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            music_file.extension = ".dff"
+    
+    def test_music_file_size_is_lazy(self, temp_dir):
+        """Test that a MusicFile doesn't stat its path until size is read."""
+        file_path = temp_dir / "later.dsf"
+        music_file = MusicFile(
+            path=file_path,
+            relative_path=Path("later.dsf"),
+            extension=".dsf"
+        )
+        file_path.write_bytes(b"x" * 10)
+        
+        assert music_file.size == 10
+        file_path.write_bytes(b"x" * 20)
+        assert music_file.size == 10  # Cached after first read
+    
+    def test_music_file_given_size(self, temp_dir):
+        """Test that a size passed to the constructor is used without a stat."""
+        music_file = MusicFile(
+            path=temp_dir / "missing.dsf",
+            relative_path=Path("missing.dsf"),
+            extension=".dsf",
+            size=1234
+        )
+        
+        assert music_file.size == 1234
 
 
 class TestNonMusicFile:
@@ -199,6 +240,14 @@ class TestDirectoryScanner:
         assert "Album 1" in album_names
         assert "Album 2" in album_names
     
+    def test_scan_parallel_matches_sequential(self, sample_multi_album_structure):
+        """Test that threaded album scanning returns the same albums in the same order."""
+        sequential = DirectoryScanner(max_workers=1).scan(sample_multi_album_structure)
+        parallel = DirectoryScanner(max_workers=4).scan(sample_multi_album_structure)
+        
+        assert [a.name for a in parallel] == [a.name for a in sequential]
+        assert [a.file_count for a in parallel] == [a.file_count for a in sequential]
+    
     def test_scan_nested_album(self, sample_nested_album_structure):
         """Test scanning album with nested subdirectories."""
         scanner = DirectoryScanner()
@@ -212,6 +261,31 @@ class TestDirectoryScanner:
         assert "CD1" in album.subdirectories
         assert "CD2" in album.subdirectories
     
+    def test_scan_lists_each_directory_once(self, temp_input_dir, monkeypatch):
+        """Test that a scan never re-examines a directory, album roots included."""
+        artist_dir = temp_input_dir / "Artist"
+        for name in ("Album 1", "Album 2"):
+            (artist_dir / name).mkdir(parents=True)
+            (artist_dir / name / "track.dsf").write_text("mock dsf")
+        (temp_input_dir / "Empty").mkdir()
+        
+        listed = Counter()
+        real_scandir = scanner_module.os.scandir
+        
+        def counting_scandir(path):
+            listed[str(path)] += 1
+            return real_scandir(path)
+        
+        monkeypatch.setattr(scanner_module.os, "scandir", counting_scandir)
+        albums = DirectoryScanner(max_workers=1).scan(temp_input_dir)
+        
+        assert len(albums) == 2
+        for directory in (temp_input_dir, artist_dir, temp_input_dir / "Empty"):
+            assert listed[str(directory)] == 1
+        # Flat albums are built from the discovery listing alone
+        for name in ("Album 1", "Album 2"):
+            assert listed[str(artist_dir / name)] == 1
+    
     def test_scan_empty_directory(self, temp_input_dir):
         """Test scanning an empty directory."""
         scanner = DirectoryScanner()
@@ -267,6 +341,15 @@ class TestDirectoryScanner:
         extensions = {f.extension for f in album.music_files}
         assert extensions == {'.iso', '.dsf', '.dff'}
     
+    def test_scan_shares_extension_strings(self, sample_multi_album_structure):
+        """Test that files with the same extension share one string object."""
+        scanner = DirectoryScanner()
+        albums = scanner.scan(sample_multi_album_structure)
+        
+        dsf_files = [f for album in albums for f in album.music_files if f.extension == '.dsf']
+        assert len(dsf_files) == 2
+        assert dsf_files[0].extension is dsf_files[1].extension
+    
     def test_scan_case_insensitive_extensions(self, temp_input_dir):
         """Test that extension matching is case-insensitive."""
         album_path = temp_input_dir / "Case Test Album"
@@ -281,6 +364,27 @@ class TestDirectoryScanner:
         assert len(albums) == 1
         assert albums[0].file_count == 3
     
+    def test_extension_matches_path_suffix(self):
+        """Test that name-based extension parsing agrees with Path.suffix."""
+        names = ["track.DSF", "a.b.iso", ".DS_Store", ".hidden.txt", "README", "name.", "x.Tar.Gz"]
+        for name in names:
+            assert _extension(name) == Path(name).suffix.lower()
+    
+    def test_scan_classifies_files_by_extension(self, temp_input_dir):
+        """Test the music / copy / extensionless / ignored file classification."""
+        album_path = temp_input_dir / "Album"
+        album_path.mkdir()
+        for name in ("track.DSF", "cover.JPG", "README", "notes.xyz", "archive.tar.gz"):
+            (album_path / name).write_text("mock")
+        
+        album = DirectoryScanner().scan(temp_input_dir)[0]
+        
+        assert [(f.relative_path, f.extension) for f in album.music_files] == [(Path("track.DSF"), ".dsf")]
+        assert [(f.relative_path, f.extension) for f in album.non_music_files] == [
+            (Path("README"), ""),
+            (Path("cover.JPG"), ".jpg"),
+        ]
+    
     def test_is_album_method(self, sample_album_structure, temp_input_dir):
         """Test _is_album method."""
         scanner = DirectoryScanner()
@@ -293,6 +397,24 @@ class TestDirectoryScanner:
         empty_dir.mkdir()
         assert scanner._is_album(empty_dir) is False
     
+    def test_is_album_stops_at_first_music_file(self, temp_input_dir, monkeypatch):
+        """Test that _is_album doesn't list subdirectories once music is found."""
+        album_path = temp_input_dir / "Album"
+        (album_path / "Artwork" / "Scans").mkdir(parents=True)
+        (album_path / "track.dsf").write_text("mock dsf")
+        
+        listed = []
+        real_scandir = scanner_module.os.scandir
+        
+        def recording_scandir(path):
+            listed.append(str(path))
+            return real_scandir(path)
+        
+        monkeypatch.setattr(scanner_module.os, "scandir", recording_scandir)
+        
+        assert DirectoryScanner()._is_album(album_path) is True
+        assert listed == [str(album_path)]
+    
     def test_scan_album_file_sorting(self, temp_input_dir):
         """Test that scanned files are sorted."""
         album_path = temp_input_dir / "Sorted Album"
@@ -359,6 +481,20 @@ class TestDirectoryScanner:
         for music_file in cd1_files:
             assert str(music_file.relative_path).startswith("CD1/")
     
+    def test_scanned_files_equal_constructed_files(self, sample_nested_album_structure):
+        """Test that scanned records hold Paths and compare equal to hand-built ones."""
+        scanner = DirectoryScanner()
+        album = scanner.scan(sample_nested_album_structure, single_album=True)[0]
+        
+        for music_file in album.music_files:
+            assert isinstance(music_file.relative_path, Path)
+            assert album.root_path / music_file.relative_path == music_file.path
+            assert music_file == MusicFile(
+                path=music_file.path,
+                relative_path=music_file.path.relative_to(album.root_path),
+                extension=music_file.extension
+            )
+    
     def test_scan_with_hidden_files(self, temp_input_dir):
         """Test that hidden files are handled appropriately."""
         album_path = temp_input_dir / "Album With Hidden"
@@ -372,8 +508,22 @@ class TestDirectoryScanner:
         
         # Should find the album
         assert len(albums) == 1
-        # Hidden files may or may not be included depending on scanner logic
-        # The main test is that it doesn't crash
+        # Hidden files are skipped by default
+        assert albums[0].non_music_files == []
+        
+        scanner = DirectoryScanner(include_hidden=True)
+        albums = scanner.scan(temp_input_dir)
+        hidden = sorted(f.relative_path.name for f in albums[0].non_music_files)
+        assert hidden == [".DS_Store", ".hidden.txt"]
+    
+    def test_scan_skips_hidden_directories(self, temp_input_dir):
+        """Test that music inside hidden directories doesn't make an album."""
+        trash = temp_input_dir / ".Trash" / "Old Album"
+        trash.mkdir(parents=True)
+        (trash / "track.dsf").write_text("mock")
+        
+        assert DirectoryScanner().scan(temp_input_dir) == []
+        assert len(DirectoryScanner(include_hidden=True).scan(temp_input_dir)) == 1
     
     def test_extensionless_files(self, temp_input_dir):
         """Test handling of files without extensions."""
@@ -2,11 +2,12 @@
 Unit tests for state_manager module (StateManager, AlbumStatus, etc.).
 """
 
+import os
 import pytest
 import json
-import time
 from pathlib import Path
 from datetime import datetime
+import state_manager as state_manager_module
 from state_manager import (
     StateManager,
     AlbumStatus,
@@ -16,17 +17,83 @@ from state_manager import (
 )
 
 
+# Directories and arguments for the default session most tests run against
+INPUT_DIR = Path("/input")
+OUTPUT_DIR = Path("/output")
+ARCHIVE_DIR = Path("/archive")
+
+SESSION_KWARGS = {
+    "input_dir": INPUT_DIR,
+    "output_dir": OUTPUT_DIR,
+    "archive_dir": ARCHIVE_DIR,
+    "conversion_mode": "iso_dsf_to_flac",
+    "sample_rate": 88200,
+    "bit_depth": 24,
+    "enrich_metadata": False,
+}
+
+
+def _music_files(album_path, count=2):
+    """(source, output) pairs for tracks 01..count of an album."""
+    return [
+        (album_path / f"{n:02d}.dsf", album_path / f"{n:02d}.flac")
+        for n in range(1, count + 1)
+    ]
+
+
+# Wall-clock time seen by state_manager while the frozen_clock fixture is active
+FROZEN_NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Pin datetime.now() inside state_manager to FROZEN_NOW."""
+    monkeypatch.setattr(state_manager_module, "datetime", _FrozenDatetime)
+    return FROZEN_NOW
+
+
+@pytest.fixture
+def fresh_manager_with_session(temp_state_dir):
+    """StateManager with a default session already created and saved."""
+    manager = StateManager(state_dir=temp_state_dir)
+    manager.create_session(**SESSION_KWARGS)
+    return manager
+
+
+@pytest.fixture
+def album_path(temp_dir):
+    """Path of the album most album management tests add to the session."""
+    return temp_dir / "Test Album"
+
+
+@pytest.fixture(scope="module")
+def persisted_session(tmp_path_factory):
+    """Session written to disk once and shared by the read-only round-trip tests."""
+    state_dir = tmp_path_factory.mktemp("persist")
+    manager = StateManager(state_dir=state_dir)
+    session = manager.create_session(**{**SESSION_KWARGS, "enrich_metadata": True})
+    return manager, session, state_dir
+
+
 class TestAlbumStatus:
     """Tests for AlbumStatus enum."""
     
     def test_album_status_values(self):
         """Test AlbumStatus enum values."""
-        assert AlbumStatus.PENDING.value == "pending"
-        assert AlbumStatus.ARCHIVING.value == "archiving"
-        assert AlbumStatus.CONVERTING.value == "converting"
-        assert AlbumStatus.COMPLETED.value == "completed"
-        assert AlbumStatus.FAILED.value == "failed"
-        assert AlbumStatus.SKIPPED.value == "skipped"
+        assert {status.name: status.value for status in AlbumStatus} == {
+            "PENDING": "pending",
+            "ARCHIVING": "archiving",
+            "CONVERTING": "converting",
+            "COMPLETED": "completed",
+            "FAILED": "failed",
+            "SKIPPED": "skipped",
+        }
 
 
 class TestDataclasses:
@@ -116,20 +183,12 @@ class TestSessionManagement:
         """Test creating a new session."""
         manager = StateManager(state_dir=temp_state_dir)
         
-        session = manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        session = manager.create_session(**SESSION_KWARGS)
         
         assert session is not None
         assert manager.session == session
-        assert session.input_dir == "/input"
-        assert session.output_dir == "/output"
+        assert session.input_dir == str(INPUT_DIR)
+        assert session.output_dir == str(OUTPUT_DIR)
         assert session.conversion_mode == "iso_dsf_to_flac"
         assert session.sample_rate == 88200
         assert session.bit_depth == 24
@@ -137,23 +196,13 @@ class TestSessionManagement:
         # State file should be created
         assert manager.state_file.exists()
     
-    def test_session_id_format(self, temp_state_dir):
+    def test_session_id_format(self, frozen_clock, fresh_manager_with_session):
         """Test that session ID has correct format (timestamp)."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        session = manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        session = fresh_manager_with_session.session
         
         # Session ID should be in format YYYYMMDD_HHMMSS
-        assert len(session.session_id) == 15
-        assert "_" in session.session_id
+        assert session.session_id == "20250101_120000"
+        assert session.started_at == "2025-01-01T12:00:00"
     
     def test_load_nonexistent_session(self, temp_state_dir):
         """Test loading session when no state file exists."""
@@ -163,23 +212,12 @@ class TestSessionManagement:
         
         assert session is None
     
-    def test_save_and_load_session(self, temp_state_dir):
+    def test_save_and_load_session(self, persisted_session):
         """Test saving and loading a session."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        # Create session
-        original_session = manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=True
-        )
+        _, original_session, state_dir = persisted_session
         
         # Create new manager and load session
-        manager2 = StateManager(state_dir=temp_state_dir)
+        manager2 = StateManager(state_dir=state_dir)
         loaded_session = manager2.load_session()
         
         assert loaded_session is not None
@@ -188,39 +226,20 @@ class TestSessionManagement:
         assert loaded_session.conversion_mode == original_session.conversion_mode
         assert loaded_session.enrich_metadata == original_session.enrich_metadata
     
-    def test_mark_completed(self, temp_state_dir):
+    def test_mark_completed(self, frozen_clock, fresh_manager_with_session):
         """Test marking session as completed."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        session = manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
+        session = manager.session
         
         assert session.completed_at is None
         
         manager.mark_completed()
         
-        assert manager.session.completed_at is not None
+        assert manager.session.completed_at == frozen_clock.isoformat()
     
-    def test_clear_state(self, temp_state_dir):
+    def test_clear_state(self, fresh_manager_with_session):
         """Test clearing state."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
         assert manager.state_file.exists()
         assert manager.session is not None
@@ -234,27 +253,11 @@ class TestSessionManagement:
 class TestAlbumManagement:
     """Tests for album management."""
     
-    def test_add_album(self, temp_state_dir, temp_dir):
+    def test_add_album(self, fresh_manager_with_session, album_path):
         """Test adding an album to session."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
-        album_path = temp_dir / "Test Album"
-        music_files = [
-            (album_path / "01.dsf", album_path / "01.flac"),
-            (album_path / "02.dsf", album_path / "02.flac")
-        ]
+        manager = fresh_manager_with_session
         
-        manager.add_album(album_path, "Test Album", music_files)
+        manager.add_album(album_path, "Test Album", _music_files(album_path))
         
         assert len(manager.session.albums) == 1
         album = manager.session.albums[0]
@@ -269,21 +272,10 @@ class TestAlbumManagement:
         with pytest.raises(RuntimeError, match="No active session"):
             manager.add_album(Path("/album"), "Album", [])
     
-    def test_update_album_status(self, temp_state_dir, temp_dir):
+    def test_update_album_status(self, fresh_manager_with_session, album_path):
         """Test updating album status."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
-        album_path = temp_dir / "Test Album"
         manager.add_album(album_path, "Test Album", [])
         
         # Update status
@@ -295,24 +287,13 @@ class TestAlbumManagement:
         album = manager.session.albums[0]
         assert album.status == AlbumStatus.CONVERTING.value
     
-    def test_update_album_with_archive_path(self, temp_state_dir, temp_dir):
+    def test_update_album_with_archive_path(self, fresh_manager_with_session, album_path):
         """Test updating album with archive path."""
-        manager = StateManager(state_dir=temp_state_dir)
+        manager = fresh_manager_with_session
         
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
-        album_path = temp_dir / "Test Album"
         manager.add_album(album_path, "Test Album", [])
         
-        archive_path = Path("/archive/Test_Album_20250101")
+        archive_path = ARCHIVE_DIR / "Test_Album_20250101"
         manager.update_album_status(
             album_path,
             AlbumStatus.CONVERTING,
@@ -322,21 +303,10 @@ class TestAlbumManagement:
         album = manager.session.albums[0]
         assert album.archive_path == str(archive_path)
     
-    def test_update_album_with_error(self, temp_state_dir, temp_dir):
+    def test_update_album_with_error(self, fresh_manager_with_session, album_path):
         """Test updating album status with error message."""
-        manager = StateManager(state_dir=temp_state_dir)
+        manager = fresh_manager_with_session
         
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
-        album_path = temp_dir / "Test Album"
         manager.add_album(album_path, "Test Album", [])
         
         manager.update_album_status(
@@ -350,19 +320,9 @@ class TestAlbumManagement:
         assert album.error_message == "Conversion failed"
         assert album.completed_at is not None
     
-    def test_get_pending_albums(self, temp_state_dir, temp_dir):
+    def test_get_pending_albums(self, fresh_manager_with_session, temp_dir):
         """Test getting pending albums."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
         # Add albums with different statuses
         album1 = temp_dir / "Album1"
@@ -378,126 +338,40 @@ class TestAlbumManagement:
         pending = manager.get_pending_albums()
         
         assert len(pending) == 2
-        pending_names = {a.album_name for a in pending}
-        assert "Album1" in pending_names
-        assert "Album3" in pending_names
+        assert {a.album_name for a in pending} == {"Album1", "Album3"}
 
 
 class TestFileManagement:
     """Tests for file status management."""
     
-    def test_update_file_status(self, temp_state_dir, temp_dir):
-        """Test updating file conversion status."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
+    @pytest.fixture
+    def album_with_file(self, fresh_manager_with_session, temp_dir):
+        """Session holding one album with a single pending file."""
+        manager = fresh_manager_with_session
         album_path = temp_dir / "Album"
         file_path = album_path / "01.dsf"
-        music_files = [(file_path, album_path / "01.flac")]
-        
-        manager.add_album(album_path, "Album", music_files)
-        
-        # Update file status
-        manager.update_file_status(album_path, file_path, "converting")
-        
-        file_state = manager.session.albums[0].files[0]
-        assert file_state.status == "converting"
-        assert file_state.attempts == 1
+        manager.add_album(album_path, "Album", _music_files(album_path, count=1))
+        return manager, album_path, file_path
     
-    def test_update_file_status_multiple_attempts(self, temp_state_dir, temp_dir):
-        """Test that attempts are incremented properly."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
-        album_path = temp_dir / "Album"
-        file_path = album_path / "01.dsf"
-        music_files = [(file_path, album_path / "01.flac")]
-        
-        manager.add_album(album_path, "Album", music_files)
-        
-        # Multiple attempts
-        manager.update_file_status(album_path, file_path, "converting")
-        manager.update_file_status(album_path, file_path, "converting")
-        manager.update_file_status(album_path, file_path, "converting")
+    @pytest.mark.parametrize("status, updates, error_message, expected", [
+        ("converting", 1, None, {"status": "converting", "attempts": 1, "completed_at": None}),
+        ("converting", 3, None, {"status": "converting", "attempts": 3}),
+        ("failed", 1, "ffmpeg error", {"status": "failed", "error_message": "ffmpeg error"}),
+        ("completed", 1, None, {"status": "completed", "attempts": 0, "error_message": None}),
+    ], ids=["converting", "multiple_attempts", "with_error", "completed"])
+    def test_update_file_status(self, album_with_file, status, updates, error_message, expected):
+        """Test file status updates, attempt counting, errors and completion time."""
+        manager, album_path, file_path = album_with_file
+        
+        for _ in range(updates):
+            manager.update_file_status(album_path, file_path, status, error_message=error_message)
         
         file_state = manager.session.albums[0].files[0]
-        assert file_state.attempts == 3
-    
-    def test_update_file_status_with_error(self, temp_state_dir, temp_dir):
-        """Test updating file status with error message."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
-        album_path = temp_dir / "Album"
-        file_path = album_path / "01.dsf"
-        music_files = [(file_path, album_path / "01.flac")]
-        
-        manager.add_album(album_path, "Album", music_files)
-        
-        manager.update_file_status(
-            album_path,
-            file_path,
-            "failed",
-            error_message="ffmpeg error"
-        )
-        
-        file_state = manager.session.albums[0].files[0]
-        assert file_state.status == "failed"
-        assert file_state.error_message == "ffmpeg error"
-        assert file_state.completed_at is not None
-    
-    def test_update_file_status_completed(self, temp_state_dir, temp_dir):
-        """Test updating file status to completed."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
-        
-        album_path = temp_dir / "Album"
-        file_path = album_path / "01.dsf"
-        music_files = [(file_path, album_path / "01.flac")]
-        
-        manager.add_album(album_path, "Album", music_files)
-        
-        manager.update_file_status(album_path, file_path, "completed")
-        
-        file_state = manager.session.albums[0].files[0]
-        assert file_state.status == "completed"
-        assert file_state.completed_at is not None
+        for attr, value in expected.items():
+            assert getattr(file_state, attr) == value
+        # Terminal states are timestamped
+        if status in ("completed", "failed"):
+            assert file_state.completed_at is not None
 
 
 class TestPauseResume:
@@ -509,19 +383,9 @@ class TestPauseResume:
         
         assert manager.check_pause_signal() is False
     
-    def test_create_pause_signal(self, temp_state_dir):
+    def test_create_pause_signal(self, fresh_manager_with_session):
         """Test creating pause signal."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
         manager.create_pause_signal()
         
@@ -529,19 +393,9 @@ class TestPauseResume:
         assert manager.check_pause_signal() is True
         assert manager.session.paused is True
     
-    def test_clear_pause_signal(self, temp_state_dir):
+    def test_clear_pause_signal(self, fresh_manager_with_session):
         """Test clearing pause signal."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
         manager.create_pause_signal()
         assert manager.check_pause_signal() is True
@@ -556,19 +410,9 @@ class TestPauseResume:
 class TestStatistics:
     """Tests for get_statistics method."""
     
-    def test_statistics_empty_session(self, temp_state_dir):
+    def test_statistics_empty_session(self, fresh_manager_with_session):
         """Test statistics with no albums."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
         stats = manager.get_statistics()
         
@@ -576,31 +420,16 @@ class TestStatistics:
         assert stats['albums_completed'] == 0
         assert stats['files_total'] == 0
     
-    def test_statistics_with_albums(self, temp_state_dir, temp_dir):
+    def test_statistics_with_albums(self, fresh_manager_with_session, temp_dir):
         """Test statistics calculation with albums."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager = fresh_manager_with_session
         
         # Add albums
         album1 = temp_dir / "Album1"
         album2 = temp_dir / "Album2"
         
-        manager.add_album(album1, "Album1", [
-            (album1 / "01.dsf", album1 / "01.flac"),
-            (album1 / "02.dsf", album1 / "02.flac")
-        ])
-        manager.add_album(album2, "Album2", [
-            (album2 / "01.dsf", album2 / "01.flac")
-        ])
+        manager.add_album(album1, "Album1", _music_files(album1))
+        manager.add_album(album2, "Album2", _music_files(album2, count=1))
         
         # Update statuses
         manager.update_album_status(album1, AlbumStatus.COMPLETED)
@@ -631,19 +460,9 @@ class TestStatistics:
 class TestStatePersistence:
     """Tests for state file persistence and recovery."""
     
-    def test_state_file_json_format(self, temp_state_dir):
+    def test_state_file_json_format(self, persisted_session):
         """Test that state file is valid JSON."""
-        manager = StateManager(state_dir=temp_state_dir)
-        
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        manager, _, _ = persisted_session
         
         # Read state file directly
         with open(manager.state_file, 'r') as f:
@@ -653,33 +472,53 @@ class TestStatePersistence:
         assert 'input_dir' in data
         assert 'albums' in data
     
-    def test_atomic_write(self, temp_state_dir):
-        """Test that state saves use atomic write."""
+    def test_json_fallback_round_trip(self, temp_state_dir, monkeypatch):
+        """Test that state saves and loads without orjson installed."""
+        monkeypatch.setattr(state_manager_module, "orjson", None)
         manager = StateManager(state_dir=temp_state_dir)
+        session = manager.create_session(**SESSION_KWARGS)
         
-        manager.create_session(
-            input_dir=Path("/input"),
-            output_dir=Path("/output"),
-            archive_dir=Path("/archive"),
-            conversion_mode="iso_dsf_to_flac",
-            sample_rate=88200,
-            bit_depth=24,
-            enrich_metadata=False
-        )
+        loaded = StateManager(state_dir=temp_state_dir).load_session()
         
-        # State file should exist
-        assert manager.state_file.exists()
+        assert loaded is not None
+        assert loaded.session_id == session.session_id
+    
+    def test_non_utf8_album_path_round_trip(self, fresh_manager_with_session):
+        """Test that album paths from non-UTF-8 filenames save and load."""
+        manager = fresh_manager_with_session
+        album_path = Path(os.fsdecode(b'/in/caf\xe9 album'))
+        
+        manager.add_album(album_path, "Album", [])
+        
+        loaded = StateManager(state_dir=manager.state_dir).load_session()
+        assert loaded is not None
+        assert loaded.albums[0].album_path == str(album_path)
+    
+    def test_atomic_write(self, persisted_session):
+        """Test that state saves use atomic write."""
+        manager, _, state_dir = persisted_session
         
-        # Temp file should not exist after save
-        temp_file = manager.state_file.with_suffix('.tmp')
-        assert not temp_file.exists()
+        # Only the state file remains; no temp file is left behind after save
+        names = {entry.name for entry in os.scandir(state_dir)}
+        assert names == {StateManager.STATE_FILE}
     
-    def test_load_corrupted_state(self, temp_state_dir):
+    @pytest.mark.parametrize("payload", [
+        "{invalid json",
+        "",
+        '{"session_id": "20250101_120000", "albums": [',
+        "[]",
+        "null",
+        '{"session_id": "20250101_120000"}',
+        '{"albums": [{"album_name": "Album"}]}',
+        "\x00\x00\x00",
+    ], ids=["invalid", "empty", "truncated", "array", "null",
+            "missing_fields", "bad_album", "binary"])
+    def test_load_corrupted_state(self, temp_state_dir, payload):
         """Test loading corrupted state file."""
         manager = StateManager(state_dir=temp_state_dir)
         
         # Write corrupted JSON
-        manager.state_file.write_text("{invalid json")
+        manager.state_file.write_text(payload)
         
         # Should handle gracefully
         session = manager.load_session()
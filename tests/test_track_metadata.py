@@ -3,217 +3,178 @@ Tests for track metadata extraction functionality.
 """
 
 import pytest
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
-import tempfile
-import sys
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock, MagicMock
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+try:
+    from main import ConversionOrchestrator, extract_track_metadata
+    MAIN_AVAILABLE = True
+except ImportError:
+    MAIN_AVAILABLE = False
 
-from main import ConversionOrchestrator
-from config import Config
+pytestmark = pytest.mark.skipif(
+    not MAIN_AVAILABLE,
+    reason="main module dependencies (click, duckdb, mutagen, ...) not installed"
+)
+
+
+# Empty placeholder files the extraction tests point at; tags and durations
+# come from mocks, only the files' existence and names matter
+TRACK_FILE_NAMES = (
+    "test_source.flac",
+    "test_output.flac",
+    "source.iso",
+    "01 - II B.S.flac",
+    "05 - Beautiful Track.flac",
+    "03 - Track Name.flac",
+    "test.flac",
+)
+
+
+# Read-only tag sets returned by the mocked MutagenFLAC, shared across tests
+MOCK_AUDIO_FULL = MappingProxyType({
+    'title': ['Test Track Title'],
+    'tracknumber': ['3'],
+    'artist': ['Test Artist'],
+    'album': ['Test Album'],
+    'date': ['2023'],
+    'performer': ['John Doe - Piano'],
+    'composer': ['Jane Smith']
+})
+
+MOCK_AUDIO_TRACK_OF_TOTAL = MappingProxyType({
+    'title': ['Track Seven'],
+    'tracknumber': ['7/12']  # Track 7 of 12
+})
+
+
+@pytest.fixture(scope="session")
+def track_dir(tmp_path_factory):
+    """Directory holding the empty TRACK_FILE_NAMES files, created once."""
+    directory = tmp_path_factory.mktemp("tracks")
+    for name in TRACK_FILE_NAMES:
+        (directory / name).touch()
+    return directory
 
 
 class TestTrackMetadataExtraction:
-    """Tests for _extract_track_metadata method."""
+    """Tests for extract_track_metadata function."""
     
-    @pytest.fixture
-    def mock_orchestrator(self, tmp_path):
-        """Create a mock orchestrator for testing."""
-        # Create a mock orchestrator directly without full initialization
-        orchestrator = Mock(spec=ConversionOrchestrator)
-        
-        # Add the actual method we want to test
-        orchestrator._extract_track_metadata = ConversionOrchestrator._extract_track_metadata.__get__(orchestrator)
-        
-        # Mock the required attributes
-        orchestrator.converter = Mock()
-        orchestrator.logger = Mock()
-        orchestrator.config = Mock()
-        orchestrator.config.get.return_value = 'iso_dsf_to_flac'
-        
-        return orchestrator
+    @pytest.fixture(autouse=True)
+    def mutagen_flac(self, monkeypatch):
+        """Replace main.MutagenFLAC with a mock for every test in this class."""
+        fake = MagicMock()
+        monkeypatch.setattr("main.MutagenFLAC", fake)
+        return fake
     
-    def test_extract_metadata_from_flac_with_mutagen(self, mock_orchestrator, tmp_path):
-        """Test metadata extraction from FLAC file using mutagen."""
-        # Create a temporary FLAC file
-        source_file = tmp_path / "test_source.flac"
-        output_file = tmp_path / "test_output.flac"
-        source_file.touch()
-        output_file.touch()
-        
-        # Mock mutagen FLAC reading
-        mock_audio = {
-            'title': ['Test Track Title'],
-            'tracknumber': ['3'],
-            'artist': ['Test Artist'],
-            'album': ['Test Album'],
-            'date': ['2023'],
-            'performer': ['John Doe - Piano'],
-            'composer': ['Jane Smith']
-        }
-        
-        # Mock ffprobe file info
-        mock_orchestrator.converter.get_file_info.return_value = {
-            'format': {
-                'duration': '245.67'
-            }
-        }
-        
-        with patch('main.MutagenFLAC') as mock_flac:
-            mock_flac.return_value = mock_audio
-            
-            metadata = mock_orchestrator._extract_track_metadata(
-                source_file_path=source_file,
-                output_file_path=output_file,
-                is_from_iso=False
-            )
-        
-        # Verify extracted metadata
-        assert metadata['title'] == 'Test Track Title'
-        assert metadata['track_number'] == 3
-        assert metadata['artist'] == 'Test Artist'
-        assert metadata['album'] == 'Test Album'
-        assert metadata['date'] == '2023'
-        assert metadata['duration_seconds'] == 245.67
-        assert metadata['musicians'] is not None
-        assert len(metadata['musicians']) == 2
-        assert metadata['musicians'][0]['role'] == 'performer'
-        assert metadata['musicians'][0]['name'] == 'John Doe - Piano'
-    
-    def test_extract_metadata_from_iso_track(self, mock_orchestrator, tmp_path):
-        """Test metadata extraction from ISO-converted track."""
-        # Create a temporary file with ISO-style naming
-        source_file = tmp_path / "source.iso"
-        output_file = tmp_path / "01 - II B.S.flac"
-        source_file.touch()
-        output_file.touch()
-        
-        # Mock ffprobe file info
-        mock_orchestrator.converter.get_file_info.return_value = {
-            'format': {
-                'duration': '180.5'
-            }
-        }
-        
-        # For ISO files, mutagen reads from output file
-        with patch('main.MutagenFLAC') as mock_flac:
-            # Simulate ISO track with minimal metadata
-            mock_flac.return_value = {}
-            
-            metadata = mock_orchestrator._extract_track_metadata(
-                source_file_path=source_file,
-                output_file_path=output_file,
-                is_from_iso=True
-            )
-        
-        # Verify extracted metadata
-        assert metadata['track_number'] == 1  # Extracted from filename "01 - ..."
-        assert metadata['title'] == 'II B.S'  # Extracted from filename, cleaned up
-        assert metadata['duration_seconds'] == 180.5
+    @pytest.mark.parametrize("source_name, output_name, mock_audio, is_from_iso, duration, expected", [
+        # Tags read from the FLAC source with mutagen
+        ("test_source.flac", "test_output.flac", MOCK_AUDIO_FULL, False, '245.67', {
+            'title': 'Test Track Title',
+            'track_number': 3,
+            'artist': 'Test Artist',
+            'album': 'Test Album',
+            'date': '2023',
+            'duration_seconds': 245.67,
+            'musicians': [
+                {'role': 'performer', 'name': 'John Doe - Piano'},
+                {'role': 'composer', 'name': 'Jane Smith'},
+            ],
+        }),
+        # ISO tracks are read from the output file; minimal tags, so the
+        # track number and cleaned-up title come from "01 - ..." filename
+        ("source.iso", "01 - II B.S.flac", {}, True, '180.5', {
+            'track_number': 1,
+            'title': 'II B.S',
+            'duration_seconds': 180.5,
+        }),
+        # FLAC with no tags falls back to filename parsing
+        ("05 - Beautiful Track.flac", "05 - Beautiful Track.flac", {}, False, '300.0', {
+            'track_number': 5,
+            'title': 'Beautiful Track',
+            'duration_seconds': 300.0,
+        }),
+        # MutagenFLAC unavailable: filename and ffprobe only
+        ("03 - Track Name.flac", "03 - Track Name.flac", None, False, '150.25', {
+            'track_number': 3,
+            'title': 'Track Name',
+            'duration_seconds': 150.25,
+        }),
+        # Track number in 'N/Total' format keeps just the track number
+        ("test.flac", "test.flac", MOCK_AUDIO_TRACK_OF_TOTAL, False, '200.0', {
+            'track_number': 7,
+            'title': 'Track Seven',
+        }),
+        # Track number tag without a title: title still comes from the filename
+        ("05 - Beautiful Track.flac", "05 - Beautiful Track.flac", {'tracknumber': ['9']}, False, '300.0', {
+            'track_number': 9,
+            'title': 'Beautiful Track',
+        }),
+    ], ids=["flac_with_mutagen", "iso_track", "filename_fallback", "no_mutagen",
+            "track_number_with_total", "track_number_without_title"])
+    def test_extract_metadata(self, mutagen_flac, track_dir, monkeypatch,
+                              source_name, output_name, mock_audio, is_from_iso, duration,
+                              expected):
+        """Test metadata extraction from tags, filenames and ffprobe."""
+        # Stub ffprobe file info
+        file_info = {'format': {'duration': duration}}
+        converter = SimpleNamespace(get_file_info=lambda path: file_info)
+        
+        if mock_audio is None:
+            # Simulate MutagenFLAC not being available
+            monkeypatch.setattr("main.MutagenFLAC", None)
+        else:
+            mutagen_flac.return_value = mock_audio
+        
+        metadata = extract_track_metadata(
+            converter,
+            Mock(),
+            source_file_path=track_dir / source_name,
+            output_file_path=track_dir / output_name,
+            is_from_iso=is_from_iso
+        )
+        
+        for key, value in expected.items():
+            assert metadata[key] == value, key
     
-    def test_extract_metadata_filename_fallback(self, mock_orchestrator, tmp_path):
-        """Test metadata extraction falls back to filename parsing."""
-        source_file = tmp_path / "05 - Beautiful Track.flac"
-        output_file = tmp_path / "05 - Beautiful Track.flac"
-        source_file.touch()
-        output_file.touch()
-        
-        # Mock ffprobe file info
-        mock_orchestrator.converter.get_file_info.return_value = {
-            'format': {
-                'duration': '300.0'
-            }
+    def test_sacd_disc_fields_fill_album_gaps(self, track_dir):
+        """Test that SACD disc fields fill gaps in the album section, as in FLAC tags."""
+        sacd_metadata = {
+            'disc': {'title': 'Disc Title', 'genre': 'Jazz', 'artist': 'Disc Artist'},
+            'album': {'title': 'Album Title'},
+            'tracks': [{'track_number': 1, 'title': 'First'}],
         }
         
-        # Simulate FLAC with no metadata
-        with patch('main.MutagenFLAC') as mock_flac:
-            mock_flac.return_value = {}
-            
-            metadata = mock_orchestrator._extract_track_metadata(
-                source_file_path=source_file,
-                output_file_path=output_file,
-                is_from_iso=False
-            )
-        
-        # Verify fallback to filename
-        assert metadata['track_number'] == 5
-        assert metadata['title'] == 'Beautiful Track'
-        assert metadata['duration_seconds'] == 300.0
+        metadata = extract_track_metadata(
+            SimpleNamespace(get_file_info=lambda path: None),
+            Mock(),
+            source_file_path=track_dir / "source.iso",
+            output_file_path=track_dir / "01 - II B.S.flac",
+            is_from_iso=True,
+            sacd_metadata=sacd_metadata,
+            track_number=1
+        )
+        
+        assert metadata['title'] == 'First'
+        assert metadata['album'] == 'Album Title'
+        assert metadata['genre'] == 'Jazz'
+        assert metadata['artist'] == 'Disc Artist'
     
-    def test_extract_metadata_no_mutagen(self, mock_orchestrator, tmp_path):
-        """Test metadata extraction when mutagen is not available."""
-        source_file = tmp_path / "03 - Track Name.flac"
-        output_file = tmp_path / "03 - Track Name.flac"
-        source_file.touch()
-        output_file.touch()
+    def test_orchestrator_method_delegates(self, track_dir):
+        """Test that ConversionOrchestrator._extract_track_metadata uses its converter."""
+        orchestrator = SimpleNamespace(
+            converter=SimpleNamespace(get_file_info=lambda path: {'format': {'duration': '61.0'}}),
+            logger=Mock()
+        )
+        
+        metadata = ConversionOrchestrator._extract_track_metadata(
+            orchestrator,
+            source_file_path=track_dir / "03 - Track Name.flac",
+            output_file_path=track_dir / "03 - Track Name.flac"
+        )
         
-        # Mock ffprobe file info
-        mock_orchestrator.converter.get_file_info.return_value = {
-            'format': {
-                'duration': '150.25'
-            }
-        }
-        
-        # Simulate MutagenFLAC not being available
-        with patch('main.MutagenFLAC', None):
-            metadata = mock_orchestrator._extract_track_metadata(
-                source_file_path=source_file,
-                output_file_path=output_file,
-                is_from_iso=False
-            )
-        
-        # Should still extract from filename and ffprobe
         assert metadata['track_number'] == 3
-        assert metadata['title'] == 'Track Name'
-        assert metadata['duration_seconds'] == 150.25
-    
-    def test_extract_metadata_handles_track_number_with_total(self, mock_orchestrator, tmp_path):
-        """Test handling of track number in 'N/Total' format."""
-        source_file = tmp_path / "test.flac"
-        output_file = tmp_path / "test.flac"
-        source_file.touch()
-        output_file.touch()
-        
-        # Mock mutagen with track number format "7/12"
-        mock_audio = {
-            'title': ['Track Seven'],
-            'tracknumber': ['7/12']  # Track 7 of 12
-        }
-        
-        mock_orchestrator.converter.get_file_info.return_value = {
-            'format': {'duration': '200.0'}
-        }
-        
-        with patch('main.MutagenFLAC') as mock_flac:
-            mock_flac.return_value = mock_audio
-            
-            metadata = mock_orchestrator._extract_track_metadata(
-                source_file_path=source_file,
-                output_file_path=output_file,
-                is_from_iso=False
-            )
-        
-        # Should extract just the track number, not the total
-        assert metadata['track_number'] == 7
-        assert metadata['title'] == 'Track Seven'
-
-
-class TestTrackDatabaseCreation:
-    """Tests for track database creation during conversion."""
-    
-    def test_database_called_for_single_file_conversion(self):
-        """Test that database.create_track is called for single-file conversions."""
-        # This would be an integration test that requires actual conversion
-        # For now, we verify the logic is in place
-        pass
-    
-    def test_database_called_for_iso_multitrack(self):
-        """Test that database.create_track is called for each ISO track."""
-        # This would be an integration test that requires actual conversion
-        # For now, we verify the logic is in place
-        pass
+        assert metadata['duration_seconds'] == 61.0
 
 
 if __name__ == '__main__':
@@ -7,15 +7,21 @@ Tests that records are properly committed and persist across connections.
 from pathlib import Path
 from src.database import MusicDatabase
 from src.album_metadata import AlbumMetadata
+import logging
 import uuid
+import shutil
 import tempfile
 
+logger = logging.getLogger(__name__)
+
+
 def test_database_persistence():
     """Test that database records persist across connections."""
     
-    # Use a temporary database for testing
-    with tempfile.NamedTemporaryFile(suffix='.duckdb', delete=False) as f:
-        db_path = Path(f.name)
+    # Use a temporary database for testing. DuckDB refuses to open an
+    # existing empty file, so only the directory is created up front.
+    db_dir = Path(tempfile.mkdtemp())
+    db_path = db_dir / "verify.duckdb"
     
     try:
         print("Testing database persistence...")
@@ -26,6 +32,7 @@ def test_database_persistence():
         test_album_name = "Test Album"
         test_source_path = "/test/source"
         test_checksum = "test_checksum_123"
+        test_archive_path = "/test/archive"
         
         # Phase 1: Create and commit a record
         print("\n1. Creating album record...")
@@ -40,6 +47,7 @@ def test_database_persistence():
         
         if not success:
             print("❌ FAILED: Could not create album")
+            db.close()
             return False
         
         print("✓ Album record created")
@@ -72,10 +80,10 @@ def test_database_persistence():
         print(f"   Checksum: {album['audio_files_checksum']}")
         
         # Verify the data matches
-        if (album['album_id'] == test_album_id and
-            album['album_name'] == test_album_name and
-            album['source_path'] == test_source_path and
-            album['audio_files_checksum'] == test_checksum):
+        expected = (test_album_id, test_album_name, test_source_path, test_checksum)
+        actual = (album['album_id'], album['album_name'],
+                  album['source_path'], album['audio_files_checksum'])
+        if actual == expected:
             print("✓ All data matches!")
         else:
             print("❌ FAILED: Data mismatch")
@@ -84,8 +92,6 @@ def test_database_persistence():
         
         # Phase 3: Test update and commit
         print("\n3. Testing update and commit...")
-        test_archive_path = "/test/archive"
-        
         success = db2.update_album(
             album_id=test_album_id,
             archive_path=test_archive_path
@@ -111,17 +117,15 @@ def test_database_persistence():
         db3 = MusicDatabase(db_path)
         
         album = db3.get_album_by_id(test_album_id)
+        db3.close()
         
         if not album or album['archive_path'] != test_archive_path:
             print("❌ FAILED: Update did not persist")
-            db3.close()
             return False
         
         print("✓ Update persisted correctly!")
         print(f"   Archive Path: {album['archive_path']}")
         
-        db3.close()
-        
         print("\n" + "="*60)
         print("✅ ALL TESTS PASSED!")
         print("="*60)
@@ -132,15 +136,13 @@ def test_database_persistence():
         
     except Exception as e:
         print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Database persistence check failed")
         return False
         
     finally:
         # Cleanup
-        if db_path.exists():
-            db_path.unlink()
-            print(f"\nCleaned up test database: {db_path}")
+        shutil.rmtree(db_dir, ignore_errors=True)
+        print(f"\nCleaned up test database: {db_path}")
 
 
 def test_actual_database():
@@ -186,6 +188,8 @@ def test_actual_database():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    
     print("="*60)
     print("Database Persistence Verification")
     print("="*60)